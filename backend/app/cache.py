@@ -0,0 +1,139 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class TTLCache(Generic[K, V]):
+    """Cache LRU em memória, com expiração por tempo e número máximo de entradas.
+
+    É local ao processo: com vários workers, cada um tem o seu, e o TTL limita
+    por quanto tempo uma entrada invalidada em outro processo continua valendo.
+    Com weigher, max_entries limita a soma dos pesos em vez da quantidade.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, weigher: Optional[Callable[[V], int]] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.weigher = weigher
+        self._entries: "OrderedDict[K, Tuple[float, V, int]]" = OrderedDict()
+        self._weight = 0
+        self._lock = Lock()
+
+    def _remove(self, key: K) -> Tuple[float, V, int]:
+        entry = self._entries.pop(key)
+        self._weight -= entry[2]
+        return entry
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V):
+        weight = self.weigher(value) if self.weigher else 1
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, weight)
+            self._weight += weight
+            while self._weight > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def pop(self, key: K) -> Optional[V]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            return self._remove(key)[1]
+
+    def pop_where(self, predicate: Callable[[V], bool]) -> int:
+        with self._lock:
+            keys = [key for key, (_, value, _) in self._entries.items() if predicate(value)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class VersionedCache(Generic[K, V]):
+    """TTLCache em que cada chave tem uma versão que só cresce.
+
+    bump() invalida a chave. Quem consulta o banco lê version() antes e passa
+    o valor para set(), que descarta o resultado se houve um bump no meio:
+    uma leitura concorrente com uma escrita não repõe dados antigos no cache.
+
+    As versões vêm de um contador único e só as das chaves com bump recente
+    ficam guardadas, num LRU de até max_versions. Uma chave fora dele vale o
+    piso, que nunca é menor que uma versão descartada: a versão de cada chave
+    continua só crescendo e a memória fica limitada.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        weigher: Optional[Callable[[V], int]] = None,
+        max_versions: Optional[int] = None,
+    ):
+        self._entries: TTLCache[K, Tuple[int, V]] = TTLCache(
+            ttl_seconds,
+            max_entries,
+            (lambda entry: weigher(entry[1])) if weigher else None,
+        )
+        self.max_versions = max_versions or max_entries
+        self._versions: "OrderedDict[K, int]" = OrderedDict()
+        self._counter = 0
+        self._floor = 0
+        self._lock = Lock()
+
+    def version(self, key: K) -> int:
+        return self._versions.get(key, self._floor)
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != self.version(key):
+            return None
+        return entry[1]
+
+    def set(self, key: K, version: int, value: V) -> bool:
+        with self._lock:
+            if self.version(key) != version:
+                return False
+            self._entries.set(key, (version, value))
+            return True
+
+    def bump(self, key: K) -> int:
+        with self._lock:
+            self._counter += 1
+            version = self._versions[key] = self._counter
+            self._versions.move_to_end(key)
+            while len(self._versions) > self.max_versions:
+                _, dropped = self._versions.popitem(last=False)
+                self._floor = max(self._floor, dropped)
+            self._entries.pop(key)
+            return version
+
+    def clear(self):
+        with self._lock:
+            # o piso acima de toda versão já lida invalida as leituras em andamento
+            self._counter += 1
+            self._floor = self._counter
+            self._versions.clear()
+            self._entries.clear()
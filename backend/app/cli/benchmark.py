@@ -0,0 +1,228 @@
+"""Mede latência e instruções SQL por requisição nos caminhos mais usados da API.
+
+Uso: python -m app.cli.benchmark [--email E] [--password S] [--requests N]
+       [--warmup N] [--only CENÁRIO ...] [--save-baseline ARQUIVO]
+       [--baseline ARQUIVO] [--tolerance PCT]
+
+A aplicação roda no próprio processo, pelo TestClient do FastAPI, contra o
+banco de settings.database_url (por exemplo, gerado com app.cli.seed).
+Com --baseline, compara com uma execução salva por --save-baseline e sai com
+código 1 se algum cenário piorou o p95 além da tolerância ou passou a emitir
+mais instruções SQL por requisição.
+
+Os mesmos cenários rodam no pytest (tests/test_benchmark.py), com poucos
+dados e poucas requisições; BENCHMARK_BASELINE compara com um baseline salvo.
+"""
+import argparse
+import datetime
+import json
+import statistics
+import sys
+import time
+from itertools import cycle
+from typing import Callable, Dict, List, Optional
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.database import async_engine, async_read_engine, engine, read_engine
+from app.main import app
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        self.engines = [engine, read_engine]
+        for async_db_engine in (async_engine, async_read_engine):
+            if async_db_engine is not None:
+                self.engines.append(async_db_engine.sync_engine)
+        for target in self.engines:
+            event.listen(target, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def close(self):
+        for target in self.engines:
+            event.remove(target, "before_cursor_execute", self._on_execute)
+
+
+class Context:
+    """Dados do usuário logado usados para montar as requisições dos cenários"""
+
+    def __init__(self, client: TestClient, email: str, password: str):
+        self.client = client
+        self.email = email
+        self.password = password
+        self.login()
+        accounts = self.get("/api/accounts/", params={"limit": 100})["accounts"]
+        categories = self.get("/api/categories/", params={"limit": 100})
+        if not accounts or not categories:
+            raise SystemExit(f"{email} não tem contas ou categorias; gere os dados com app.cli.seed")
+        self.account_id = accounts[0]["id"]
+        self.expense_category_id = next(
+            (c["id"] for c in categories if c["category_type"] == "EXPENSES"), categories[0]["id"]
+        )
+        page = self.get("/api/transactions/", params={"limit": 20})
+        if not page["data"]:
+            raise SystemExit(f"{email} não tem transações; gere os dados com app.cli.seed")
+        self.transaction_id = page["data"][0]["id"]
+        self.cursor = page["next_cursor"]
+        latest = datetime.date.fromisoformat(page["data"][0]["date"])
+        self.year, self.month = latest.year, latest.month
+        self.range_start = (latest - datetime.timedelta(days=90)).isoformat()
+        self.range_end = latest.isoformat()
+        self.created: List[int] = []
+        self.updates = cycle(["1.23", "4.56", "7.89"])
+
+    def login(self):
+        response = self.client.post("/api/auth/login", json={"email": self.email, "password": self.password})
+        if response.status_code != 200:
+            raise SystemExit(f"falha no login de {self.email}: {response.status_code} {response.text}")
+        return response
+
+    def get(self, url: str, **kwargs):
+        response = self.client.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def create(self):
+        response = self.client.post("/api/transactions/", json={
+            "amount": "12.34",
+            "category_id": self.expense_category_id,
+            "account_id": self.account_id,
+            "date": self.range_end,
+            "comment": "benchmark",
+        })
+        if response.status_code == 201:
+            self.created.append(response.json()["id"])
+        return response
+
+    def update(self):
+        return self.client.patch(
+            f"/api/transactions/{self.created[-1]}",
+            json={"amount": next(self.updates)},
+        )
+
+    def delete(self):
+        return self.client.delete(f"/api/transactions/{self.created.pop()}")
+
+
+def transactions(**params) -> Callable[[Context], object]:
+    return lambda ctx: ctx.client.get("/api/transactions/", params=params)
+
+
+# (nome, requisição); a ordem importa: create gera as linhas usadas por update e delete
+SCENARIOS: List[tuple] = [
+    ("login", lambda ctx: ctx.login()),
+    ("list", transactions(limit=20)),
+    ("list_without_total", transactions(limit=20, include_total=False)),
+    ("list_cursor", lambda ctx: ctx.client.get("/api/transactions/", params={"limit": 20, "cursor": ctx.cursor})),
+    ("list_month", lambda ctx: ctx.client.get("/api/transactions/", params={"year": ctx.year, "month": ctx.month, "limit": 20})),
+    ("list_date_range", lambda ctx: ctx.client.get("/api/transactions/", params={
+        "start_date": ctx.range_start, "end_date": ctx.range_end, "limit": 20,
+    })),
+    ("list_category", lambda ctx: ctx.client.get("/api/transactions/", params={"category_id": ctx.expense_category_id, "limit": 20})),
+    ("list_account_amount_desc", lambda ctx: ctx.client.get("/api/transactions/", params={
+        "account_id": ctx.account_id, "order_by": "amount:desc", "limit": 20,
+    })),
+    ("summary_month", lambda ctx: ctx.client.get("/api/transactions/", params={"summary": True, "year": ctx.year, "month": ctx.month})),
+    ("summary_date_range", lambda ctx: ctx.client.get("/api/transactions/", params={
+        "summary": True, "start_date": ctx.range_start, "end_date": ctx.range_end,
+    })),
+    ("get", lambda ctx: ctx.client.get(f"/api/transactions/{ctx.transaction_id}")),
+    ("list_accounts", lambda ctx: ctx.client.get("/api/accounts/")),
+    ("create", lambda ctx: ctx.create()),
+    ("update", lambda ctx: ctx.update()),
+    ("delete", lambda ctx: ctx.delete()),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return statistics.quantiles(sorted_values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def run_scenario(ctx: Context, counter: StatementCounter, request, requests: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        request(ctx)
+    timings: List[float] = []
+    statements = 0
+    for _ in range(requests):
+        before = counter.count
+        started = time.perf_counter()
+        response = request(ctx)
+        timings.append((time.perf_counter() - started) * 1000)
+        statements += counter.count - before
+        if response.status_code >= 400:
+            raise SystemExit(f"resposta inesperada: {response.status_code} {response.text}")
+    timings.sort()
+    return {
+        "requests": requests,
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "statements": round(statements / requests, 2),
+    }
+
+
+def compare(name: str, result: Dict[str, float], baseline: Optional[Dict[str, float]], tolerance: float) -> tuple:
+    """Retorna (texto da comparação, houve regressão)"""
+    if baseline is None:
+        return "sem baseline", False
+    change = (result["p95_ms"] - baseline["p95_ms"]) / baseline["p95_ms"] * 100 if baseline["p95_ms"] else 0.0
+    regressed = change > tolerance or result["statements"] > baseline["statements"]
+    text = f"p95 {change:+.1f}%, sql {baseline['statements']:g} -> {result['statements']:g}"
+    return (text + " REGRESSÃO" if regressed else text), regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", default="user1@example.com")
+    parser.add_argument("--password", default="benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="requisições medidas por cenário")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--only", nargs="+", metavar="CENÁRIO", help="roda apenas os cenários informados")
+    parser.add_argument("--save-baseline", metavar="ARQUIVO")
+    parser.add_argument("--baseline", metavar="ARQUIVO")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="piora aceitável do p95, em %%")
+    args = parser.parse_args()
+
+    scenarios = [(name, request) for name, request in SCENARIOS if not args.only or name in args.only]
+    if args.only and "create" not in args.only and {"update", "delete"} & set(args.only):
+        raise SystemExit("update e delete dependem do cenário create")
+    baseline: Dict[str, Dict[str, float]] = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+
+    counter = StatementCounter()
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = 0
+    with TestClient(app, base_url="https://testserver") as client:
+        ctx = Context(client, args.email, args.password)
+        print(f"{'cenário':26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'sql/req':>8}")
+        for name, request in scenarios:
+            result = run_scenario(ctx, counter, request, args.requests, args.warmup)
+            results[name] = result
+            line = (
+                f"{name:26} {result['p50_ms']:9.2f} {result['p95_ms']:9.2f} "
+                f"{result['p99_ms']:9.2f} {result['statements']:8.2f}"
+            )
+            if args.baseline:
+                text, regressed = compare(name, result, baseline.get(name), args.tolerance)
+                regressions += regressed
+                line += f"  {text}"
+            print(line)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"requests": args.requests, "scenarios": results}, f, indent=2)
+        print(f"baseline salvo em {args.save_baseline}")
+    if regressions:
+        print(f"{regressions} cenário(s) com regressão")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Verifica, via EXPLAIN QUERY PLAN, se as consultas de transações usam índices.
+
+Uso: python -m app.cli.check_query_plans (também roda no pytest, em
+tests/test_query_plans.py)
+"""
+import datetime
+import sys
+from decimal import Decimal
+from itertools import product
+from sqlalchemy import text
+from app.database import LocalSession
+from app.models.category import CategoryType
+from app.repositories.rollup import TransactionRollupRepository
+from app.repositories.transaction import TransactionRepository
+
+
+FILTER_CASES = [
+    {},
+    {"date": datetime.date(2024, 5, 10)},
+    {"start_date": datetime.date(2024, 1, 1), "end_date": datetime.date(2024, 12, 31)},
+    {"month": 5, "year": 2024},
+    {"year": 2024},
+    {"month": 5},
+    {"account_id": 1},
+    {"account_id": 1, "year": 2024},
+    {"category_id": [1, 2]},
+    {"category_id": [1], "month": 5, "year": 2024},
+    {"category_type": CategoryType.EXPENSES},
+    {"category_type": CategoryType.INCOME, "account_id": 1, "month": 5, "year": 2024},
+]
+
+ORDER_CASES = [
+    {"date": "desc"},
+    {"date": "asc"},
+    {"amount": "desc"},
+    {"amount": "asc"},
+]
+
+
+KEYSET_AFTER = {
+    "date": (datetime.date(2024, 5, 10), 100),
+    "amount": (Decimal("150.00"), 100),
+}
+
+
+def explain(session, query):
+    sql = query.compile(
+        dialect=session.get_bind().dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return [row[3] for row in rows]
+
+
+def table_scans(plan):
+    return [detail for detail in plan if detail.startswith("SCAN ")]
+
+
+def collect_queries(repo: TransactionRepository, rollup_repo: TransactionRollupRepository):
+    for filters in FILTER_CASES:
+        filter_by = {"user_id": 1, **filters}
+        yield "count_rows", filter_by, repo.count_query(filter_by)
+        yield "get_summary", filter_by, repo.summary_query(filter_by)
+        if rollup_repo.covers(filter_by):
+            yield "get_summary (rollup)", filter_by, rollup_repo.summary_query(filter_by)
+    for filters, order_by in product(FILTER_CASES, ORDER_CASES):
+        filter_by = {"user_id": 1, **filters}
+        yield f"list_all {order_by}", filter_by, repo.list_query(0, 10, filter_by, order_by)
+        yield f"list_page {order_by}", filter_by, repo.page_query(0, 10, filter_by, order_by)
+        after = KEYSET_AFTER[next(iter(order_by))]
+        yield f"list_all {order_by} after={after}", filter_by, repo.list_query(0, 10, filter_by, order_by, after)
+        yield f"list_page {order_by} after={after}", filter_by, repo.page_query(0, 10, filter_by, order_by, after)
+
+
+def main() -> int:
+    failures = 0
+    with LocalSession() as session:
+        repo = TransactionRepository(session)
+        rollup_repo = TransactionRollupRepository(session)
+        for name, filter_by, query in collect_queries(repo, rollup_repo):
+            plan = explain(session, query)
+            scans = table_scans(plan)
+            if scans:
+                failures += 1
+                print(f"FALHA {name} {filter_by}")
+                for detail in plan:
+                    print(f"    {detail}")
+    if failures:
+        print(f"{failures} consulta(s) sem uso de índice")
+        return 1
+    print("Todas as consultas usam índices")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""Remove do banco as sessões expiradas ou revogadas.
+
+Uso: python -m app.cli.reap_sessions [--batch-size N] [--max-batches N]
+"""
+import argparse
+import sys
+from app.config import settings
+from app.maintenance import reap_sessions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=settings.session_reaper_batch_size)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+    reclaimed = reap_sessions(args.batch_size, args.max_batches)
+    print(f"{reclaimed} sessão(ões) removida(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Recalcula a tabela transaction_rollups e confere com o agregado das transações.
+
+Uso: python -m app.cli.rebuild_rollups [--check]
+"""
+import argparse
+import sys
+from app.database import LocalSession
+from app.repositories.rollup import TransactionRollupRepository
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="apenas confere o rollup atual, sem recalcular",
+    )
+    args = parser.parse_args()
+    with LocalSession() as session:
+        repo = TransactionRollupRepository(session)
+        try:
+            if not args.check:
+                rows = repo.rebuild()
+                print(f"{rows} linha(s) de rollup recalculadas")
+            mismatches = repo.find_mismatches()
+            if mismatches:
+                session.rollback()
+                print(f"{mismatches} chave(s) divergentes entre rollup e transações")
+                return 1
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+    print("Rollup consistente com as transações")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
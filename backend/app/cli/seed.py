@@ -0,0 +1,179 @@
+"""Gera um banco sintético para testes de carga e benchmarks.
+
+Uso: python -m app.cli.seed [--users N] [--accounts N] [--categories N]
+       [--transactions N] [--days N] [--password SENHA] [--seed N]
+
+O banco de settings.database_url deve estar migrado e sem esses usuários.
+Os usuários são user1@example.com ... userN@example.com, todos com a mesma
+senha. O volume de lançamentos por usuário segue uma distribuição de Pareto
+(poucos usuários concentram a maior parte) e o user1 é sempre o mais pesado;
+as datas se concentram nos meses mais recentes e os valores seguem uma
+log-normal, com despesas frequentes e pequenas e receitas raras e maiores.
+"""
+import argparse
+import bisect
+import datetime
+import random
+import sys
+import time
+from decimal import Decimal
+from itertools import accumulate
+from typing import Dict, List, Tuple
+from app import hashing
+from app.database import LocalSession
+from app.models.category import CategoryType
+from app.repositories.account import AccountRepository, BalanceDeltas, add_balance_delta
+from app.repositories.category import CategoryRepository
+from app.repositories.rollup import TransactionRollupRepository
+from app.repositories.transaction import TransactionRepository
+from app.repositories.user import UserRepository
+from app.security import argon2_params
+
+
+ACCOUNT_NAMES = ["Carteira", "Conta corrente", "Poupança", "Cartão de crédito", "Investimentos"]
+CATEGORY_NAMES = {
+    CategoryType.EXPENSES: [
+        "Mercado", "Aluguel", "Transporte", "Restaurantes", "Saúde",
+        "Educação", "Lazer", "Contas da casa", "Assinaturas", "Viagens",
+    ],
+    CategoryType.INCOME: ["Salário", "Freelance", "Rendimentos", "Reembolsos"],
+}
+COLORS = ["#ef4444", "#f97316", "#eab308", "#22c55e", "#06b6d4", "#3b82f6", "#8b5cf6", "#ec4899"]
+COMMENTS = ["Pix", "Débito automático", "Parcela", "Boleto", "Transferência"]
+EXPENSE_RATIO = 0.85
+MAX_AMOUNT = Decimal("99999999.99")
+# lançamentos gerados e gravados por vez
+CHUNK_SIZE = 20_000
+
+
+def random_amount(rng: random.Random, category_type: CategoryType) -> Decimal:
+    if category_type == CategoryType.EXPENSES:
+        value = rng.lognormvariate(3.8, 1.0)  # mediana em torno de 45
+    else:
+        value = rng.lognormvariate(7.6, 0.6)  # mediana em torno de 2000
+    return min(Decimal(f"{value:.2f}"), MAX_AMOUNT)
+
+
+def create_users(session, count: int, password: str) -> List[int]:
+    # todos com a mesma senha: um único hash, sem passar pelo pool de processos
+    password_hash = hashing.hash_password(password, argon2_params)
+    users = UserRepository(session).create_many([
+        {"name": f"Usuário {n}", "email": f"user{n}@example.com", "password_hash": password_hash}
+        for n in range(1, count + 1)
+    ])
+    return [user.id for user in users]
+
+
+def create_accounts(
+    session,
+    rng: random.Random,
+    user_ids: List[int],
+    per_user: int,
+) -> Tuple[Dict[int, List[int]], Dict[int, Decimal]]:
+    rows = [
+        {
+            "name": ACCOUNT_NAMES[n % len(ACCOUNT_NAMES)],
+            "balance": Decimal(rng.randint(0, 5000)),
+            "color": rng.choice(COLORS),
+            "user_id": user_id,
+        }
+        for user_id in user_ids
+        for n in range(per_user)
+    ]
+    accounts_by_user: Dict[int, List[int]] = {}
+    balances: Dict[int, Decimal] = {}
+    for account in AccountRepository(session).create_many(rows):
+        accounts_by_user.setdefault(account.user_id, []).append(account.id)
+        balances[account.id] = account.balance
+    return accounts_by_user, balances
+
+
+def create_categories(
+    session,
+    user_ids: List[int],
+    per_user: int,
+) -> Dict[Tuple[int, CategoryType], List[int]]:
+    # ao menos uma receita por usuário; o restante são despesas
+    income = max(1, per_user // 4)
+    names = (
+        [(CategoryType.EXPENSES, name) for name in CATEGORY_NAMES[CategoryType.EXPENSES]][:max(1, per_user - income)]
+        + [(CategoryType.INCOME, name) for name in CATEGORY_NAMES[CategoryType.INCOME]][:income]
+    )
+    rows = [
+        {"name": name, "category_type": category_type, "color": COLORS[n % len(COLORS)], "user_id": user_id}
+        for user_id in user_ids
+        for n, (category_type, name) in enumerate(names)
+    ]
+    categories: Dict[Tuple[int, CategoryType], List[int]] = {}
+    for category in CategoryRepository(session).create_many(rows):
+        categories.setdefault((category.user_id, category.category_type), []).append(category.id)
+    return categories
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--accounts", type=int, default=3, help="contas por usuário")
+    parser.add_argument("--categories", type=int, default=8, help="categorias por usuário")
+    parser.add_argument("--transactions", type=int, default=50_000, help="total de lançamentos")
+    parser.add_argument("--days", type=int, default=730, help="período coberto, até hoje")
+    parser.add_argument("--password", default="benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    with LocalSession() as session:
+        try:
+            user_ids = create_users(session, args.users, args.password)
+            accounts_by_user, balances = create_accounts(session, rng, user_ids, args.accounts)
+            categories = create_categories(session, user_ids, args.categories)
+            print(f"{len(user_ids)} usuário(s), {len(balances)} conta(s) e categorias criados")
+
+            weights = sorted((rng.paretovariate(1.16) for _ in user_ids), reverse=True)
+            cum_weights = list(accumulate(weights))
+            today = datetime.date.today()
+            transaction_repo = TransactionRepository(session)
+            balance_deltas: BalanceDeltas = {}
+            created = 0
+            while created < args.transactions:
+                size = min(CHUNK_SIZE, args.transactions - created)
+                rows = []
+                for _ in range(size):
+                    index = bisect.bisect_left(cum_weights, rng.random() * cum_weights[-1])
+                    user_id = user_ids[min(index, len(user_ids) - 1)]
+                    category_type = CategoryType.EXPENSES if rng.random() < EXPENSE_RATIO else CategoryType.INCOME
+                    account_id = rng.choice(accounts_by_user[user_id])
+                    amount = random_amount(rng, category_type)
+                    signed = -amount if category_type == CategoryType.EXPENSES else amount
+                    add_balance_delta(balance_deltas, account_id, signed)
+                    rows.append({
+                        "user_id": user_id,
+                        "account_id": account_id,
+                        "category_id": rng.choice(categories[(user_id, category_type)]),
+                        "category_type": category_type,
+                        "amount": amount,
+                        "date": today - datetime.timedelta(days=int(rng.triangular(0, args.days, 0))),
+                        "comment": rng.choice(COMMENTS) if rng.random() < 0.3 else None,
+                    })
+                transaction_repo.bulk_create(rows)
+                created += size
+                print(f"{created}/{args.transactions} lançamento(s)")
+
+            AccountRepository(session).bulk_update({
+                account_id: {"balance": balances[account_id] + delta}
+                for account_id, delta in balance_deltas.items()
+            })
+            rollups = TransactionRollupRepository(session).rebuild()
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+    elapsed = time.perf_counter() - started
+    print(f"{rollups} linha(s) de rollup; concluído em {elapsed:.1f}s")
+    print(f"login: user1@example.com / {args.password} (usuário com mais lançamentos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
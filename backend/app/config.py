@@ -0,0 +1,60 @@
+from typing import Literal, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    database_url: str = "sqlite:///finance.db"
+    # réplica para as rotas de leitura; sem ela, no SQLite as leituras usam
+    # um pool próprio de conexões com PRAGMA query_only
+    database_read_url: Optional[str] = None
+    # padrão: database_url com o driver assíncrono equivalente
+    database_async_url: Optional[str] = None
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_read_pool_size: int = 10
+    database_read_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 30
+    # PRAGMAs aplicados a cada conexão quando o banco é SQLite
+    sqlite_busy_timeout_ms: int = 5000
+    # negativo: tamanho em KiB (cerca de 64 MiB por conexão)
+    sqlite_cache_size: int = -64 * 1024
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    sqlite_wal_autocheckpoint: int = 1000
+    session_expires_seconds: int = 60 * 60
+    # a expiração deslizante só é gravada quando resta menos que isso
+    session_refresh_threshold_seconds: int = 50 * 60
+    session_cache_ttl_seconds: int = 30
+    session_cache_max_entries: int = 10_000
+    # categorias e contas por usuário; o limite total é em linhas e TTL 0 desliga
+    reference_cache_ttl_seconds: int = 30
+    reference_cache_max_rows: int = 100_000
+    reference_cache_max_rows_per_user: int = 500
+    # 0 desliga a limpeza periódica iniciada junto com a aplicação
+    session_reaper_interval_seconds: int = 15 * 60
+    session_reaper_batch_size: int = 500
+    # hash de senha em processos separados; 0 workers executa numa thread do asyncio
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
+    password_hash_queue_timeout_seconds: float = 2.0
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 64 * 1024
+    argon2_parallelism: int = 4
+    # requisições acima de qualquer um dos limites são registradas no log; 0 desliga
+    slow_request_ms: float = 500
+    slow_request_statements: int = 25
+    # expõe GET /metrics no formato texto do Prometheus
+    metrics_enabled: bool = True
+    # perfil por requisição com X-Profile ou ?profile=; só para diagnóstico.
+    # O cProfile registra todas as threads do processo enquanto o endpoint roda
+    profiling_enabled: bool = False
+    profiling_dir: str = "profiles"
+    # GETs de transações, contas e categorias em rotas async def sobre
+    # aiosqlite, fora do threadpool; escritas, login, importação e exportação
+    # seguem síncronas no threadpool
+    async_database: bool = False
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+
+settings = Settings()
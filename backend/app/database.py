@@ -1,11 +1,139 @@
-from sqlalchemy import create_engine, event
+from typing import Optional, Union
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.config import settings
+from app.instrumentation import install_query_hooks
+from app.metrics import db_pool_in_use, instrumented_pool
 
 
-engine = create_engine("sqlite:///finance.db")
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def async_url(url: str) -> URL:
+    """Troca o driver da URL pelo equivalente assíncrono do mesmo banco"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or "+" in parsed.drivername:
+        return parsed
+    return parsed.set(drivername=driver)
+
+def sqlite_pragmas(read_only: bool = False) -> list[str]:
+    pragmas = [
+        "PRAGMA foreign_keys = ON",
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA cache_size = {int(settings.sqlite_cache_size)}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}",
+        f"PRAGMA temp_store = {settings.sqlite_temp_store}",
+        f"PRAGMA wal_autocheckpoint = {int(settings.sqlite_wal_autocheckpoint)}",
+    ]
+    if read_only:
+        # por último: com query_only ligado o SQLite recusa qualquer escrita
+        pragmas.append("PRAGMA query_only = ON")
+    return pragmas
+
+def install_sqlite_pragmas(engine: Engine, read_only: bool = False):
+    """Aplica os PRAGMAs a cada conexão nova; em outros bancos não faz nada"""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        # o adaptador do aiosqlite não expõe autocommit; fora de uma
+        # transação explícita os PRAGMAs já são aplicados imediatamente
+        ac = getattr(dbapi_connection, "autocommit", None)
+        if ac is not None:
+            dbapi_connection.autocommit = True
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+        if ac is not None:
+            dbapi_connection.autocommit = ac
+
+def pool_options(pool_size: int, max_overflow: int, poolclass: type) -> dict:
+    return {
+        "poolclass": poolclass,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.database_pool_timeout_seconds,
+    }
+
+def read_engine_options(url: Union[str, URL], poolclass: Optional[type] = None) -> dict:
+    options = pool_options(
+        settings.database_read_pool_size,
+        settings.database_read_max_overflow,
+        poolclass or instrumented_pool(QueuePool, "read"),
+    )
+    if make_url(url).get_backend_name() == "postgresql":
+        options["execution_options"] = {"postgresql_readonly": True}
+    return options
+
+
+engine = create_engine(
+    settings.database_url,
+    **pool_options(settings.database_pool_size, settings.database_max_overflow, instrumented_pool(QueuePool, "write")),
+)
+install_sqlite_pragmas(engine)
+install_query_hooks(engine)
+db_pool_in_use.track(("write",), lambda: engine.pool.checkedout())
 
 LocalSession = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+# leituras usam um pool separado: a réplica configurada ou, sem ela, o mesmo
+# banco com conexões somente leitura, para não disputar o pool com as escritas
+_read_url: Optional[str] = settings.database_read_url or settings.database_url
+read_engine = create_engine(_read_url, **read_engine_options(_read_url))
+install_sqlite_pragmas(read_engine, read_only=True)
+install_query_hooks(read_engine)
+db_pool_in_use.track(("read",), lambda: read_engine.pool.checkedout())
+
+ReadLocalSession = sessionmaker(bind=read_engine, autocommit=False, autoflush=False)
+
+# pilha assíncrona, usada pelas rotas GET de transações, contas e categorias quando
+# settings.async_database está ligado; criada só nesse caso, para não exigir
+# o driver assíncrono (aiosqlite, asyncpg) de quem usa apenas a pilha síncrona.
+# As consultas das rotas vão para o engine somente leitura; o engine gravável
+# atende só o authorize_async, que renova e revoga sessões
+async_engine: Optional[AsyncEngine] = None
+AsyncLocalSession: Optional[async_sessionmaker[AsyncSession]] = None
+async_read_engine: Optional[AsyncEngine] = None
+AsyncReadLocalSession: Optional[async_sessionmaker[AsyncSession]] = None
+if settings.async_database:
+    async_engine = create_async_engine(
+        async_url(settings.database_async_url or settings.database_url),
+        **pool_options(
+            settings.database_pool_size,
+            settings.database_max_overflow,
+            instrumented_pool(AsyncAdaptedQueuePool, "async"),
+        ),
+    )
+    install_sqlite_pragmas(async_engine.sync_engine)
+    install_query_hooks(async_engine.sync_engine)
+    db_pool_in_use.track(("async",), lambda: async_engine.pool.checkedout())
+    # sem expirar na confirmação: acessar atributos depois do commit faria I/O implícito
+    AsyncLocalSession = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    _async_read_url = async_url(settings.database_read_url or settings.database_async_url or settings.database_url)
+    async_read_engine = create_async_engine(
+        _async_read_url,
+        **read_engine_options(
+            _async_read_url,
+            instrumented_pool(AsyncAdaptedQueuePool, "async_read"),
+        ),
+    )
+    install_sqlite_pragmas(async_read_engine.sync_engine, read_only=True)
+    install_query_hooks(async_read_engine.sync_engine)
+    db_pool_in_use.track(("async_read",), lambda: async_read_engine.pool.checkedout())
+    AsyncReadLocalSession = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
+
 class Base(DeclarativeBase):
     pass
 
@@ -19,13 +147,28 @@ def get_db():
     finally:
         db.close()
 
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    ac = dbapi_connection.autocommit
-    dbapi_connection.autocommit = True
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys = ON")
-    cursor.execute("PRAGMA journal_mode = WAL")
-    cursor.execute("PRAGMA synchronous = NORMAL")
-    cursor.close()
-    dbapi_connection.autocommit = ac
\ No newline at end of file
+def get_read_db():
+    """Sessão do pool somente leitura, para rotas que não gravam nada"""
+    db = ReadLocalSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    db = AsyncLocalSession()
+    try:
+        yield db
+    except:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+async def get_async_read_db():
+    """Sessão assíncrona do pool somente leitura"""
+    db = AsyncReadLocalSession()
+    try:
+        yield db
+    finally:
+        await db.close()
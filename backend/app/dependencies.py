@@ -1,20 +1,25 @@
 from typing import Annotated
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.repositories.account import AccountRepository
-from app.repositories.category import CategoryRepository
+from app.database import get_async_read_db, get_db, get_read_db
+from app.repositories.account import AccountRepository, AsyncAccountRepository
+from app.repositories.category import AsyncCategoryRepository, CategoryRepository
+from app.repositories.rollup import AsyncTransactionRollupRepository, TransactionRollupRepository
 from app.repositories.session import UserSessionRepository
-from app.repositories.transaction import TransactionRepository
+from app.repositories.transaction import AsyncTransactionRepository, TransactionRepository
 from app.repositories.user import UserRepository
-from app.services.account import AccountService
+from app.services.account import AccountService, AsyncAccountService
 from app.services.auth import AuthService
-from app.services.category import CategoryService
-from app.services.transaction import TransactionService
+from app.services.category import AsyncCategoryService, CategoryService
+from app.services.transaction import AsyncTransactionService, TransactionService
 from app.services.user import UserService
 
 
 DBSession = Annotated[Session, Depends(get_db)]
+# leituras: pool separado (query_only no SQLite, réplica nos demais bancos)
+ReadOnlyDBSession = Annotated[Session, Depends(get_read_db)]
+AsyncReadOnlyDBSession = Annotated[AsyncSession, Depends(get_async_read_db)]
 
 # repositories
 
@@ -33,6 +38,33 @@ def get_category_repo(db: DBSession):
 def get_transaction_repo(db: DBSession):
     return TransactionRepository(db)
 
+def get_rollup_repo(db: DBSession):
+    return TransactionRollupRepository(db)
+
+def get_read_account_repo(db: ReadOnlyDBSession):
+    return AccountRepository(db)
+
+def get_read_category_repo(db: ReadOnlyDBSession):
+    return CategoryRepository(db)
+
+def get_read_transaction_repo(db: ReadOnlyDBSession):
+    return TransactionRepository(db)
+
+def get_read_rollup_repo(db: ReadOnlyDBSession):
+    return TransactionRollupRepository(db)
+
+def get_async_account_repo(db: AsyncReadOnlyDBSession):
+    return AsyncAccountRepository(db)
+
+def get_async_category_repo(db: AsyncReadOnlyDBSession):
+    return AsyncCategoryRepository(db)
+
+def get_async_transaction_repo(db: AsyncReadOnlyDBSession):
+    return AsyncTransactionRepository(db)
+
+def get_async_rollup_repo(db: AsyncReadOnlyDBSession):
+    return AsyncTransactionRollupRepository(db)
+
 
 # services
 
@@ -57,5 +89,49 @@ def get_transaction_service(
     transaction_repo: Annotated[TransactionRepository, Depends(get_transaction_repo)],
     category_repo: Annotated[CategoryRepository, Depends(get_category_repo)],
     account_repo: Annotated[AccountRepository, Depends(get_account_repo)],
+    rollup_repo: Annotated[TransactionRollupRepository, Depends(get_rollup_repo)],
+):
+    return TransactionService(db, transaction_repo, category_repo, account_repo, rollup_repo)
+
+# services de leitura: mesmas classes, sobre a sessão somente leitura;
+# usados pelas rotas GET, que só chamam list_all/get/export
+
+def get_account_read_service(
+    db: ReadOnlyDBSession,
+    account_repo: Annotated[AccountRepository, Depends(get_read_account_repo)],
+):
+    return AccountService(db, account_repo)
+
+def get_category_read_service(
+    db: ReadOnlyDBSession,
+    category_repo: Annotated[CategoryRepository, Depends(get_read_category_repo)],
+):
+    return CategoryService(db, category_repo)
+
+def get_transaction_read_service(
+    db: ReadOnlyDBSession,
+    transaction_repo: Annotated[TransactionRepository, Depends(get_read_transaction_repo)],
+    category_repo: Annotated[CategoryRepository, Depends(get_read_category_repo)],
+    account_repo: Annotated[AccountRepository, Depends(get_read_account_repo)],
+    rollup_repo: Annotated[TransactionRollupRepository, Depends(get_read_rollup_repo)],
+):
+    return TransactionService(db, transaction_repo, category_repo, account_repo, rollup_repo)
+
+def get_async_account_service(
+    db: AsyncReadOnlyDBSession,
+    account_repo: Annotated[AsyncAccountRepository, Depends(get_async_account_repo)],
+):
+    return AsyncAccountService(db, account_repo)
+
+def get_async_category_service(
+    db: AsyncReadOnlyDBSession,
+    category_repo: Annotated[AsyncCategoryRepository, Depends(get_async_category_repo)],
+):
+    return AsyncCategoryService(db, category_repo)
+
+def get_async_transaction_service(
+    db: AsyncReadOnlyDBSession,
+    transaction_repo: Annotated[AsyncTransactionRepository, Depends(get_async_transaction_repo)],
+    rollup_repo: Annotated[AsyncTransactionRollupRepository, Depends(get_async_rollup_repo)],
 ):
-    return TransactionService(db, transaction_repo, category_repo, account_repo)
\ No newline at end of file
+    return AsyncTransactionService(db, transaction_repo, rollup_repo)
\ No newline at end of file
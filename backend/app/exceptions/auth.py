@@ -23,4 +23,12 @@ class InvalidSession(AppBaseException):
             message="Sessão expirada ou inválida",
             error_code="invalid_session",
             status_code=401
+        )
+
+class PasswordHashingBusy(AppBaseException):
+    def __init__(self):
+        super().__init__(
+            message="Servidor ocupado, tente novamente em instantes",
+            error_code="password_hashing_busy",
+            status_code=503
         )
\ No newline at end of file
@@ -7,4 +7,36 @@ class TransactionNotFound(AppBaseException):
             message="Transação não encontrada",
             error_code="transaction_not_found",
             status_code=404
+        )
+
+class InvalidCursor(AppBaseException):
+    def __init__(self):
+        super().__init__(
+            message="Cursor de paginação inválido",
+            error_code="invalid_cursor",
+            status_code=400
+        )
+
+class UnsupportedImportFormat(AppBaseException):
+    def __init__(self):
+        super().__init__(
+            message="Formato de arquivo não suportado para importação",
+            error_code="unsupported_import_format",
+            status_code=400
+        )
+
+class InvalidImportFile(AppBaseException):
+    def __init__(self):
+        super().__init__(
+            message="Arquivo de importação mal formado",
+            error_code="invalid_import_file",
+            status_code=400
+        )
+
+class CategoryTypeMismatch(AppBaseException):
+    def __init__(self):
+        super().__init__(
+            message="A categoria não é do mesmo tipo (receita ou despesa) do lançamento",
+            error_code="category_type_mismatch",
+            status_code=400
         )
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""Funções de hash de senha executadas nos processos do pool.
+
+Este módulo não importa nada da aplicação, para que os processos filhos
+(iniciados com "spawn") não carreguem engine, modelos e rotas.
+"""
+from functools import lru_cache
+from time import perf_counter
+from typing import Callable, Tuple, TypeVar
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+
+# (time_cost, memory_cost, parallelism)
+Argon2Params = Tuple[int, int, int]
+
+T = TypeVar("T")
+
+@lru_cache
+def _password_hash(params: Argon2Params) -> PasswordHash:
+    time_cost, memory_cost, parallelism = params
+    return PasswordHash((
+        Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism),
+    ))
+
+def hash_password(password: str, params: Argon2Params) -> str:
+    return _password_hash(params).hash(password)
+
+def verify_password(password: str, hashed_password: str, params: Argon2Params) -> bool:
+    return _password_hash(params).verify(password, hashed_password)
+
+def timed(fn: Callable[..., T], *args) -> Tuple[T, float]:
+    """Executa fn no processo do pool e devolve o resultado e a duração, sem a espera na fila"""
+    started = perf_counter()
+    result = fn(*args)
+    return result, perf_counter() - started
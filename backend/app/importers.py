@@ -0,0 +1,123 @@
+import codecs
+import csv
+import re
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+from app.exceptions.transaction import InvalidImportFile
+
+
+CHUNK_SIZE = 64 * 1024
+
+# linha do arquivo (ou número do lançamento no OFX) e os campos brutos
+ImportRow = Tuple[int, Dict[str, Optional[str]]]
+
+CSV_COLUMNS = ("date", "amount", "category_id", "account_id", "comment")
+
+OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def _decode_lines(file: BinaryIO, encoding: str, fallback_encoding: str) -> Iterator[str]:
+    """Decodifica o arquivo linha a linha; uma linha inválida na codificação
+    principal é lida na alternativa (exportações de bancos costumam vir em cp1252)"""
+    for raw in file:
+        try:
+            yield raw.decode(encoding)
+        except UnicodeDecodeError:
+            yield raw.decode(fallback_encoding, errors="replace")
+
+
+def iter_csv_rows(
+    file: BinaryIO,
+    encoding: str = "utf-8-sig",
+    fallback_encoding: str = "cp1252",
+) -> Iterator[ImportRow]:
+    """Lê um CSV com cabeçalho linha a linha, sem carregar o arquivo inteiro"""
+    reader = csv.DictReader(_decode_lines(file, encoding, fallback_encoding))
+    try:
+        for row in reader:
+            yield reader.line_num, {
+                column: (row.get(column) or "").strip() or None
+                for column in CSV_COLUMNS
+            }
+    except csv.Error:
+        raise InvalidImportFile
+
+
+def _iter_ofx_tokens(file: BinaryIO, encoding: str) -> Iterator[Tuple[bool, str, str]]:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    buffer = ""
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        buffer += decoder.decode(chunk, final=not chunk)
+        # o último token pode estar incompleto até o próximo bloco
+        end = len(buffer) if not chunk else buffer.rfind("<")
+        position = 0
+        for match in OFX_TOKEN.finditer(buffer, 0, max(end, 0)):
+            closing, tag, value = match.groups()
+            yield bool(closing), tag.upper(), value.strip()
+            position = match.end()
+        buffer = buffer[position:]
+        if not chunk:
+            return
+
+
+# TRNTYPE usado quando o TRNAMT não tem sinal (zero ou inválido)
+OFX_INCOME_TYPES = {"CREDIT", "DEP", "DIRECTDEP", "INT", "DIV"}
+OFX_EXPENSE_TYPES = {"DEBIT", "PAYMENT", "CHECK", "FEE", "SRVCHG", "ATM", "POS", "DIRECTDEBIT", "REPEATPMT", "CASH"}
+
+
+def _parse_ofx_amount(value: str, transaction_type: str) -> Tuple[Optional[str], Optional[str]]:
+    """Retorna o valor em módulo e o tipo (INCOME ou EXPENSES) do lançamento.
+
+    O sinal do TRNAMT decide o tipo (crédito positivo, débito negativo); sem
+    sinal, vale o TRNTYPE.
+    """
+    try:
+        amount = Decimal(value.replace(",", "."))
+    except InvalidOperation:
+        return value or None, None
+    if amount > 0:
+        category_type = "INCOME"
+    elif amount < 0:
+        category_type = "EXPENSES"
+    elif transaction_type in OFX_INCOME_TYPES:
+        category_type = "INCOME"
+    elif transaction_type in OFX_EXPENSE_TYPES:
+        category_type = "EXPENSES"
+    else:
+        category_type = None
+    return str(abs(amount)), category_type
+
+
+def iter_ofx_rows(file: BinaryIO, encoding: str = "latin-1") -> Iterator[ImportRow]:
+    """Lê os lançamentos <STMTTRN> de um extrato OFX (SGML ou XML) em blocos.
+
+    O OFX não traz categoria nem o id da conta no sistema, então category_id
+    e account_id ficam vazios para serem preenchidos pelos valores padrão da
+    importação. O valor sai em módulo e category_type diz se o lançamento é
+    receita ou despesa, para escolher a categoria padrão do tipo certo.
+    """
+    number = 0
+    current: Optional[Dict[str, str]] = None
+    for closing, tag, value in _iter_ofx_tokens(file, encoding):
+        if tag == "STMTTRN":
+            if not closing:
+                current = {}
+            elif current is not None:
+                number += 1
+                posted = current.get("DTPOSTED", "")
+                amount, category_type = _parse_ofx_amount(
+                    current.get("TRNAMT", ""),
+                    current.get("TRNTYPE", "").upper(),
+                )
+                yield number, {
+                    "date": f"{posted[0:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) >= 8 else None,
+                    "amount": amount,
+                    "category_type": category_type,
+                    "category_id": None,
+                    "account_id": None,
+                    "comment": current.get("MEMO") or current.get("NAME"),
+                }
+                current = None
+        elif current is not None and not closing and value:
+            current[tag] = value
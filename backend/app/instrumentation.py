@@ -0,0 +1,103 @@
+"""Contagem de instruções SQL e tempo de banco por requisição.
+
+Os hooks de cursor acumulam os números no RequestStats da requisição atual,
+guardado numa ContextVar; o contexto é copiado para o threadpool, então as
+rotas síncronas e os geradores de StreamingResponse escrevem no mesmo objeto.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import Engine, event
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+class RequestStats:
+    __slots__ = ("statements", "db_time", "slowest_time", "slowest_statement")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float):
+        self.statements += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if request_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = request_stats.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_start")
+    if started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+def install_query_hooks(engine: Engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """Middleware ASGI: informa os totais em Server-Timing e registra requisições lentas.
+
+    O cabeçalho sai junto com o início da resposta; consultas feitas depois
+    disso (StreamingResponse) entram apenas no log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={stats.db_time * 1000:.2f};desc="{stats.statements} queries", '
+                    f"app;dur={total_ms:.2f}"
+                )
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_stats.reset(token)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # limites em 0 desligam o respectivo critério
+            if (
+                (settings.slow_request_ms and elapsed_ms >= settings.slow_request_ms)
+                or (settings.slow_request_statements and stats.statements >= settings.slow_request_statements)
+            ):
+                logger.warning(
+                    "SlowRequest %s %s status=%s time=%.1fms statements=%d db=%.1fms slowest=%.1fms %s",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    elapsed_ms,
+                    stats.statements,
+                    stats.db_time * 1000,
+                    stats.slowest_time * 1000,
+                    " ".join((stats.slowest_statement or "").split())[:500],
+                )
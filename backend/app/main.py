@@ -1,6 +1,16 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.database import async_engine, async_read_engine
 from app.exception_handlers import add_exception_handlers
+from app.instrumentation import QueryStatsMiddleware
+from app.maintenance import run_session_reaper
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.profiling import ProfilingMiddleware
+from app.security import password_hasher_pool
 from app.routers.user import router as user_router
 from app.routers.auth import router as auth_router
 from app.routers.account import router as account_router
@@ -8,7 +18,25 @@ from app.routers.category import router as category_router
 from app.routers.transaction import router as transaction_router
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reaper = None
+    if settings.session_reaper_interval_seconds > 0:
+        reaper = asyncio.create_task(run_session_reaper(
+            settings.session_reaper_interval_seconds,
+            settings.session_reaper_batch_size,
+        ))
+    yield
+    if reaper:
+        reaper.cancel()
+        with suppress(asyncio.CancelledError):
+            await reaper
+    password_hasher_pool.shutdown()
+    for async_db_engine in (async_engine, async_read_engine):
+        if async_db_engine is not None:
+            await async_db_engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
 
 origins = ["http://localhost:5173"]
 
@@ -20,6 +48,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(QueryStatsMiddleware)
+
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
+if settings.metrics_enabled:
+    # por último, para ser o mais externo e medir a requisição inteira
+    app.add_middleware(MetricsMiddleware)
+
 add_exception_handlers(app)
 
 app.include_router(user_router, prefix="/api")
@@ -30,4 +67,9 @@ app.include_router(transaction_router, prefix="/api")
 
 @app.get("/", tags=["Healthcheck"])
 def healthcheck():
-    return "system is up"
\ No newline at end of file
+    return "system is up"
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from app.database import LocalSession
+from app.metrics import CallbackCounter, CallbackGauge, registry
+from app.repositories.session import UserSessionRepository
+
+
+logger = logging.getLogger(__name__)
+
+reaper_stats = {
+    "runs": 0,
+    "reclaimed_total": 0,
+    "last_reclaimed": 0,
+    "last_run_at": None,
+}
+
+registry.register(CallbackCounter(
+    "session_reaper_runs_total",
+    "Execuções da limpeza de sessões",
+)).track((), lambda: reaper_stats["runs"])
+registry.register(CallbackCounter(
+    "session_reaper_reclaimed_total",
+    "Sessões expiradas ou revogadas removidas pela limpeza",
+)).track((), lambda: reaper_stats["reclaimed_total"])
+registry.register(CallbackGauge(
+    "session_reaper_last_reclaimed",
+    "Sessões removidas na última execução da limpeza",
+)).track((), lambda: reaper_stats["last_reclaimed"])
+
+def _last_run_timestamp() -> float:
+    last_run_at = reaper_stats["last_run_at"]
+    return last_run_at.replace(tzinfo=timezone.utc).timestamp() if last_run_at else 0
+
+registry.register(CallbackGauge(
+    "session_reaper_last_run_timestamp_seconds",
+    "Momento da última execução da limpeza (0 se ainda não rodou)",
+)).track((), _last_run_timestamp)
+
+def reap_sessions(batch_size: int, max_batches: Optional[int] = None) -> int:
+    """Apaga sessões expiradas ou revogadas em lotes, cada um na sua transação,
+    para não segurar o lock de escrita do SQLite por muito tempo"""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    reclaimed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with LocalSession() as db:
+            try:
+                deleted = UserSessionRepository(db).delete_expired(now, batch_size)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+        reclaimed += deleted
+        batches += 1
+        if deleted < batch_size:
+            break
+    reaper_stats["runs"] += 1
+    reaper_stats["reclaimed_total"] += reclaimed
+    reaper_stats["last_reclaimed"] = reclaimed
+    reaper_stats["last_run_at"] = now
+    if reclaimed:
+        logger.info("Sessões removidas: %d", reclaimed)
+    return reclaimed
+
+async def run_session_reaper(interval_seconds: int, batch_size: int):
+    while True:
+        try:
+            await asyncio.to_thread(reap_sessions, batch_size)
+        except Exception:
+            logger.exception("SessionReaperError")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,267 @@
+"""Registro de métricas em processo, exposto em /metrics no formato texto do Prometheus.
+
+Cada thread escreve no seu próprio shard (um dict por thread), então o caminho
+quente não usa locks: só a thread dona altera os valores do seu shard, e a
+coleta copia cada shard de uma vez e soma os resultados.
+"""
+import time
+from bisect import bisect_left
+from threading import get_ident
+from typing import Callable, Dict, List, Sequence, Tuple
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._shards: Dict[int, dict] = {}
+
+    def _shard(self) -> dict:
+        shard = self._shards.get(get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(get_ident(), {})
+        return shard
+
+    def _snapshots(self) -> List[dict]:
+        return [dict(shard) for shard in list(self._shards.values())]
+
+    def samples(self) -> List[Tuple[str, Labels, Sequence[str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, extra, value in self.samples():
+            names = self.labelnames + (("le",) if extra else ())
+            lines.append(f"{self.name}{suffix}{_format_labels(names, labels + tuple(extra))} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, *labels: str):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def samples(self):
+        totals: Dict[Labels, float] = {}
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        if not self.labelnames and not totals:
+            totals[()] = 0
+        return [("", labels, (), value) for labels, value in sorted(totals.items())]
+
+    def value(self, *labels: str) -> float:
+        return sum(shard.get(labels, 0) for shard in self._snapshots())
+
+
+class Gauge(Counter):
+    """Soma das variações de todas as threads; inc e dec podem vir de threads diferentes"""
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, *labels: str):
+        self.inc(-amount, *labels)
+
+
+class CallbackGauge(Metric):
+    """Valor lido apenas na coleta, a partir de uma função por conjunto de labels"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._callbacks: Dict[Labels, Callable[[], float]] = {}
+
+    def track(self, labels: Labels, callback: Callable[[], float]):
+        self._callbacks[labels] = callback
+
+    def samples(self):
+        return [("", labels, (), callback()) for labels, callback in sorted(self._callbacks.items())]
+
+
+class CallbackCounter(CallbackGauge):
+    """Contador mantido fora do registro, lido apenas na coleta"""
+    kind = "counter"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # contagem por faixa (a última é +Inf) seguida da soma dos valores
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def samples(self):
+        merged: Dict[Labels, List[float]] = {}
+        for shard in self._snapshots():
+            for labels, state in shard.items():
+                total = merged.setdefault(labels, [0] * len(state))
+                for index, value in enumerate(list(state)):
+                    total[index] += value
+        samples = []
+        for labels, state in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                samples.append(("_bucket", labels, (_format_value(bound),), cumulative))
+            samples.append(("_sum", labels, (), state[-1]))
+            samples.append(("_count", labels, (), cumulative))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Duração das requisições HTTP por rota",
+    ("method", "route", "status"),
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight",
+    "Requisições HTTP em andamento",
+))
+db_pool_checkouts = registry.register(Counter(
+    "db_pool_checkouts_total",
+    "Conexões retiradas do pool",
+    ("pool",),
+))
+db_pool_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Tempo para obter uma conexão do pool",
+    ("pool",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+))
+db_pool_in_use = registry.register(CallbackGauge(
+    "db_pool_connections_in_use",
+    "Conexões do pool em uso no momento da coleta",
+    ("pool",),
+))
+auth_cache_requests = registry.register(Counter(
+    "auth_session_cache_requests_total",
+    "Consultas ao cache de sessões do authorize",
+    ("result",),
+))
+auth_cache_hit_ratio = registry.register(CallbackGauge(
+    "auth_session_cache_hit_ratio",
+    "Fração das autorizações atendidas pelo cache de sessões",
+))
+reference_cache_requests = registry.register(Counter(
+    "reference_cache_requests_total",
+    "Consultas ao cache de categorias e contas por usuário",
+    ("cache", "result"),
+))
+password_hash_duration = registry.register(Histogram(
+    "password_hash_duration_seconds",
+    "Duração do Argon2 por operação, medida no processo que executa o hash",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+))
+password_hash_queue_wait = registry.register(Histogram(
+    "password_hash_queue_wait_seconds",
+    "Espera de cada operação de hash por vaga e pelo pool de processos",
+    ("operation",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+))
+password_hash_rejected = registry.register(Counter(
+    "password_hash_rejected_total",
+    "Operações de hash recusadas por falta de vaga no pool",
+))
+
+def _hit_ratio() -> float:
+    hits = auth_cache_requests.value("hit")
+    total = hits + auth_cache_requests.value("miss")
+    return hits / total if total else 0.0
+
+auth_cache_hit_ratio.track((), _hit_ratio)
+
+
+def instrumented_pool(pool_class: type, name: str) -> type:
+    """Subclasse do pool que mede cada checkout em db_pool_* com o label pool=name"""
+
+    class InstrumentedPool(pool_class):
+        def connect(self):
+            started = time.perf_counter()
+            connection = super().connect()
+            db_pool_checkout_wait.observe(time.perf_counter() - started, name)
+            db_pool_checkouts.inc(1, name)
+            return connection
+
+    InstrumentedPool.__name__ = InstrumentedPool.__qualname__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: duração por rota (o template, não o caminho) e requisições em andamento"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # o roteador do FastAPI guarda a rota encontrada no scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], route, str(status_code))
@@ -2,4 +2,5 @@ from .user import User
 from .account import Account
 from .category import Category
 from .session import UserSession
-from .transaction import Transaction
\ No newline at end of file
+from .transaction import Transaction
+from .rollup import TransactionRollup
\ No newline at end of file
@@ -11,4 +11,4 @@ class Account(Base):
     name: Mapped[str]
     balance: Mapped[Decimal] = mapped_column(Numeric(10, 2))
     color: Mapped[str]
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
\ No newline at end of file
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
\ No newline at end of file
@@ -16,4 +16,4 @@ class Category(Base):
     name: Mapped[str]
     category_type: Mapped[CategoryType] = mapped_column(Enum(CategoryType))
     color: Mapped[str]
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
\ No newline at end of file
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
\ No newline at end of file
@@ -0,0 +1,17 @@
+from decimal import Decimal
+from sqlalchemy import ForeignKey, Numeric, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class TransactionRollup(Base):
+    """Soma e quantidade de transações por usuário, conta, categoria e mês"""
+    __tablename__ = "transaction_rollups"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    year: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    month: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2), server_default=text("0"))
+    count: Mapped[int] = mapped_column(server_default=text("0"))
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import ForeignKey, func, text
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
 
@@ -14,4 +14,19 @@ class UserSession(Base):
     expires_at: Mapped[datetime]
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     revoked: Mapped[int] = mapped_column(server_default=text("0"))
-    revoked_at: Mapped[Optional[datetime]]
\ No newline at end of file
+    revoked_at: Mapped[Optional[datetime]]
+
+    # created_at e revoked voltam no próprio INSERT (RETURNING), sem um SELECT extra
+    __mapper_args__ = {"eager_defaults": True}
+
+    # usados pela limpeza de sessões: cada lado do OR tem o seu índice, e o
+    # de revogadas é parcial, pois elas são poucas perto das ativas
+    __table_args__ = (
+        Index("ix_sessions_expires_at", "expires_at"),
+        Index(
+            "ix_sessions_revoked",
+            "revoked",
+            sqlite_where=text("revoked = 1"),
+            postgresql_where=text("revoked = 1"),
+        ),
+    )
\ No newline at end of file
@@ -1,7 +1,7 @@
 import datetime
 from decimal import Decimal
 from typing import Optional
-from sqlalchemy import Enum, ForeignKey, Numeric
+from sqlalchemy import Enum, ForeignKey, Index, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 from app.models.category import CategoryType, Category
@@ -10,6 +10,12 @@ from app.models.account import Account
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_user_id_date", "user_id", "date"),
+        Index("ix_transactions_user_id_account_id_date", "user_id", "account_id", "date"),
+        Index("ix_transactions_user_id_category_id_date", "user_id", "category_id", "date"),
+        Index("ix_transactions_user_id_amount", "user_id", "amount"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     category_type: Mapped[CategoryType] = mapped_column(Enum(CategoryType))
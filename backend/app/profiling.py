@@ -0,0 +1,191 @@
+"""Perfil sob demanda de uma única requisição, com cProfile.
+
+Com settings.profiling_enabled, uma requisição com o cabeçalho X-Profile (ou
+o parâmetro ?profile=) roda o endpoint sob o cProfile:
+
+- "inline": a resposta é substituída pelo relatório em texto, ordenado por
+  tempo acumulado; o status original vai em X-Profile-Status;
+- qualquer outro valor ("1", "file"): o perfil é gravado em
+  settings.profiling_dir/<MÉTODO>_<rota>/<data e hora>.prof, para abrir com
+  pstats ou snakeviz, e o caminho vai em X-Profile-File.
+
+O profiler fica ligado enquanto o endpoint executa; as dependências ficam de
+fora. Desde o Python 3.12 o cProfile usa sys.monitoring, que vale para o
+processo inteiro: o relatório inclui tudo o que rodou nesse intervalo, em
+qualquer thread (outras requisições no threadpool, tarefas do event loop, a
+limpeza de sessões). Para números limpos, perfile sem carga concorrente.
+Só uma requisição é perfilada por vez; um pedido concorrente roda sem perfil.
+Desligado, as rotas não são embrulhadas e o middleware não é instalado.
+"""
+import cProfile
+import datetime
+import functools
+import inspect
+import io
+import logging
+import os
+import pstats
+import re
+from contextvars import ContextVar
+from threading import Lock
+from typing import Optional
+from urllib.parse import parse_qs
+from fastapi.routing import APIRoute
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_PARAM = "profile"
+INLINE = "inline"
+
+# perfil pedido pela requisição atual; o endpoint embrulhado grava nele
+profile_request: ContextVar[Optional[dict]] = ContextVar("profile_request", default=None)
+
+# desde o Python 3.12 o cProfile usa sys.monitoring e só pode haver um ativo
+# por processo (que registra todas as threads); um pedido concorrente roda
+# sem perfil em vez de falhar
+_active = Lock()
+
+def _start_profiler() -> Optional[cProfile.Profile]:
+    target = profile_request.get()
+    if target is None or target["profiler"] is not None or not _active.acquire(blocking=False):
+        return None
+    profiler = target["profiler"] = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def _stop_profiler(profiler: cProfile.Profile):
+    profiler.disable()
+    _active.release()
+
+def _profiled(endpoint):
+    """Embrulha o endpoint preservando a assinatura usada pelo FastAPI"""
+    if getattr(endpoint, "__profiled__", False):
+        # include_router recria as rotas a partir do endpoint já embrulhado
+        return endpoint
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            profiler = _start_profiler()
+            if profiler is None:
+                return await endpoint(*args, **kwargs)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _stop_profiler(profiler)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            profiler = _start_profiler()
+            if profiler is None:
+                return endpoint(*args, **kwargs)
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _stop_profiler(profiler)
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+class ProfilingRoute(APIRoute):
+    """Rota cujo endpoint pode ser perfilado; só embrulha com o perfil ligado.
+
+    O perfil registra o processo inteiro enquanto o endpoint executa, não só
+    a thread da requisição.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if settings.profiling_enabled:
+            endpoint = _profiled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _requested_mode(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1").strip().lower() or None
+    if PROFILE_PARAM.encode() in scope.get("query_string", b""):
+        values = parse_qs(scope["query_string"].decode("latin-1")).get(PROFILE_PARAM)
+        if values:
+            return values[-1].strip().lower() or None
+    return None
+
+def profile_path(method: str, route: str, now: datetime.datetime) -> str:
+    group = re.sub(r"[^A-Za-z0-9]+", "_", f"{method}_{route}").strip("_")
+    return os.path.join(settings.profiling_dir, group, now.strftime("%Y%m%dT%H%M%S%f") + ".prof")
+
+def render_stats(profiler: cProfile.Profile, limit: int = 60) -> str:
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return output.getvalue()
+
+
+class ProfilingMiddleware:
+    """Middleware ASGI: liga o perfil quando a requisição pede e entrega o resultado"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        mode = _requested_mode(scope) if scope["type"] == "http" else None
+        if mode is None or mode in ("0", "false", "off"):
+            await self.app(scope, receive, send)
+            return
+        target: dict = {"profiler": None}
+        token = profile_request.set(target)
+        try:
+            if mode == INLINE:
+                await self._inline(scope, receive, send, target)
+            else:
+                await self._to_file(scope, receive, send, target)
+        finally:
+            profile_request.reset(token)
+
+    async def _inline(self, scope, receive, send, target):
+        messages = []
+
+        async def buffer(message):
+            messages.append(message)
+
+        await self.app(scope, receive, buffer)
+        profiler = target["profiler"]
+        if profiler is None:
+            # o endpoint não chegou a rodar (rota inexistente, erro de autenticação...)
+            for message in messages:
+                await send(message)
+            return
+        body = render_stats(profiler).encode()
+        status_code = next(m["status"] for m in messages if m["type"] == "http.response.start")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profile-status", str(status_code).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _to_file(self, scope, receive, send, target):
+        started_at = datetime.datetime.now()
+        path = None
+
+        async def send_with_path(message):
+            nonlocal path
+            if message["type"] == "http.response.start" and target["profiler"] is not None:
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                path = profile_path(scope["method"], route, started_at)
+                message["headers"] = [*message.get("headers", []), (b"x-profile-file", path.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_path)
+        finally:
+            if path is not None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                target["profiler"].dump_stats(path)
+                logger.info("Profile %s %s salvo em %s", scope["method"], scope["path"], path)
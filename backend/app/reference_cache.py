@@ -0,0 +1,126 @@
+"""Cache por usuário das categorias e contas, lidas a cada tela de transações
+e em cada escrita de transação.
+
+Cada usuário guarda todas as suas linhas já convertidas em DTO, ordenadas por
+id. As escritas não mexem no cache: marcam o usuário na sessão e, depois do
+commit, a versão dele é incrementada, descartando a entrada e qualquer
+leitura que estivesse em andamento. Usuários com mais linhas que o limite
+não têm as linhas guardadas e seguem lendo do banco; o cache guarda só um
+marcador, para que a consulta do limite não se repita até a próxima escrita.
+"""
+from typing import Any, Dict, Generic, Optional, Sequence, Set, Tuple, Type, TypeVar
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.cache import VersionedCache
+from app.config import settings
+from app.database import LocalSession
+from app.metrics import reference_cache_requests
+from app.repositories.base import AsyncBaseRepository, BaseRepository
+from app.schemas.account import AccountResponseDTO
+from app.schemas.category import CategoryResponseDTO
+
+
+T = TypeVar("T", bound=BaseModel)
+
+PENDING_KEY = "reference_cache_bumps"
+
+# marcador do usuário acima de max_rows_per_user; comparado por identidade
+OVERSIZE: dict = {}
+
+class ReferenceCache(Generic[T]):
+    def __init__(self, name: str, dto: Type[T], ttl_seconds: float, max_rows: int, max_rows_per_user: int):
+        self.name = name
+        self.dto = dto
+        self.enabled = ttl_seconds > 0
+        self.max_rows_per_user = max_rows_per_user
+        # o limite é a soma das linhas guardadas, não a quantidade de usuários
+        self._cache: VersionedCache[int, Dict[int, T]] = VersionedCache(
+            ttl_seconds,
+            max_rows,
+            lambda rows: max(1, len(rows)),
+        )
+
+    def _cached(self, user_id: int) -> Optional[Dict[int, T]]:
+        """Entrada do usuário (as linhas ou OVERSIZE), ou None se é preciso ler do banco"""
+        rows = self._cache.get(user_id)
+        if rows is OVERSIZE:
+            reference_cache_requests.inc(1, self.name, "oversize")
+        elif rows is not None:
+            reference_cache_requests.inc(1, self.name, "hit")
+        else:
+            reference_cache_requests.inc(1, self.name, "miss")
+        return rows
+
+    def _list_options(self, user_id: int) -> Dict[str, Any]:
+        return {
+            "limit": self.max_rows_per_user + 1,
+            "filter_by": {"user_id": user_id},
+            "order_by": {"id": "asc"},
+        }
+
+    def _store(self, user_id: int, version: int, objs: Sequence[Any]) -> Optional[Dict[int, T]]:
+        if len(objs) > self.max_rows_per_user:
+            self._cache.set(user_id, version, OVERSIZE)
+            return None
+        rows = {obj.id: self.dto.model_validate(obj) for obj in objs}
+        self._cache.set(user_id, version, rows)
+        return rows
+
+    def load(self, repo: BaseRepository, user_id: int) -> Optional[Dict[int, T]]:
+        """Linhas do usuário por id, do cache ou do banco; None se o cache não se aplica.
+
+        O dicionário é compartilhado entre requisições e não deve ser alterado.
+        """
+        if not self.enabled:
+            return None
+        rows = self._cached(user_id)
+        if rows is not None:
+            return None if rows is OVERSIZE else rows
+        version = self._cache.version(user_id)
+        return self._store(user_id, version, repo.list_all(**self._list_options(user_id)))
+
+    async def load_async(self, repo: AsyncBaseRepository, user_id: int) -> Optional[Dict[int, T]]:
+        """Mesmo que load, lendo do banco pela pilha assíncrona"""
+        if not self.enabled:
+            return None
+        rows = self._cached(user_id)
+        if rows is not None:
+            return None if rows is OVERSIZE else rows
+        version = self._cache.version(user_id)
+        return self._store(user_id, version, await repo.list_all(**self._list_options(user_id)))
+
+    def invalidate_on_commit(self, session: Session, user_id: int):
+        session.info.setdefault(PENDING_KEY, set()).add((self, user_id))
+
+    def invalidate(self, user_id: int):
+        self._cache.bump(user_id)
+
+    def clear(self):
+        self._cache.clear()
+
+
+category_cache = ReferenceCache(
+    "categories",
+    CategoryResponseDTO,
+    settings.reference_cache_ttl_seconds,
+    settings.reference_cache_max_rows,
+    settings.reference_cache_max_rows_per_user,
+)
+account_cache = ReferenceCache(
+    "accounts",
+    AccountResponseDTO,
+    settings.reference_cache_ttl_seconds,
+    settings.reference_cache_max_rows,
+    settings.reference_cache_max_rows_per_user,
+)
+
+@event.listens_for(LocalSession, "after_commit")
+def _bump_committed(session: Session):
+    pending: Set[Tuple[ReferenceCache, int]] = session.info.pop(PENDING_KEY, set())
+    for cache, user_id in pending:
+        cache.invalidate(user_id)
+
+@event.listens_for(LocalSession, "after_rollback")
+def _discard_pending(session: Session):
+    session.info.pop(PENDING_KEY, None)
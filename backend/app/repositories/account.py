@@ -1,8 +1,114 @@
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.account import Account
-from app.repositories.base import BaseRepository
+from app.reference_cache import account_cache
+from app.repositories.base import AsyncBaseRepository, BaseRepository, QueryBuilder
 
 
-class AccountRepository(BaseRepository):
+# account_id -> variação do saldo
+BalanceDeltas = Dict[int, Decimal]
+
+
+def add_balance_delta(deltas: BalanceDeltas, account_id: int, amount: Decimal):
+    deltas[account_id] = deltas.get(account_id, Decimal(0)) + amount
+
+
+class AccountQueries(QueryBuilder[Account]):
+    def totals_query(self, filter_by: Optional[Dict[str, Any]] = None):
+        """Soma dos saldos e quantidade de contas que atendem aos filtros"""
+        query = select(
+            func.coalesce(func.sum(self.model.balance), 0).label("total_balance"),
+            func.count(self.model.id).label("total_count"),
+        )
+        for key, value in (filter_by or {}).items():
+            if key in self.model_columns:
+                query = query.where(getattr(self.model, key) == value)
+        return query
+
+    def page_query(self, offset: int = 0, limit: int = 100, filter_by: Optional[Dict[str, Any]] = None):
+        # subconsultas escalares não correlacionadas: avaliadas uma única vez e
+        # sem impedir que a página siga a ordem do índice em user_id
+        totals = self.totals_query(filter_by)
+        return self.list_query(offset, limit, filter_by, {"id": "asc"}).add_columns(
+            totals.with_only_columns(totals.selected_columns.total_balance).scalar_subquery().label("total_balance"),
+            totals.with_only_columns(totals.selected_columns.total_count).scalar_subquery().label("total_count"),
+        )
+
+
+class AccountRepository(AccountQueries, BaseRepository[Account]):
     def __init__(self, session: Session):
-        super().__init__(Account, session)
\ No newline at end of file
+        super().__init__(Account, session)
+
+    def list_page(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filter_by: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Account], Decimal, int]:
+        """Retorna a página, a soma dos saldos e o total de contas, sem carregar todas as linhas"""
+        rows = self.session.execute(self.page_query(offset, limit, filter_by)).all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total_balance, rows[0].total_count
+        # página vazia após o fim: os agregados precisam ser lidos à parte
+        total_balance, total_count = self.session.execute(self.totals_query(filter_by)).one()
+        return [], total_balance, total_count
+
+    def apply_balance_delta(self, account_id: int, user_id: int, delta: Decimal) -> bool:
+        """Soma delta ao saldo num único UPDATE, sem ler o valor antes.
+
+        Retorna False quando a conta não existe ou pertence a outro usuário.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id == account_id, self.model.user_id == user_id)
+            .values(balance=self.model.balance + delta)
+            .execution_options(synchronize_session=False)
+        )
+        dialect = self.session.get_bind().dialect
+        if dialect.update_returning:
+            new_balance = self.session.execute(stmt.returning(self.model.balance)).scalar_one_or_none()
+            updated = new_balance is not None
+        else:
+            updated = self.session.execute(stmt).rowcount == 1
+        if not updated:
+            return False
+        account_cache.invalidate_on_commit(self.session, user_id)
+        # mantém coerente a conta já carregada na sessão, sem outro SELECT
+        account = self.session.identity_map.get(self.session.identity_key(self.model, account_id))
+        if account is not None:
+            if dialect.update_returning:
+                set_committed_value(account, "balance", new_balance)
+            else:
+                self.session.expire(account, ["balance"])
+        return True
+
+    def apply_balance_deltas(self, deltas: BalanceDeltas, user_id: int) -> bool:
+        """Aplica um UPDATE por conta; False se alguma conta não foi encontrada.
+
+        Variações nulas também são gravadas, pois o UPDATE confirma a posse da conta.
+        """
+        for account_id, delta in deltas.items():
+            if not self.apply_balance_delta(account_id, user_id, delta):
+                return False
+        return True
+
+
+class AsyncAccountRepository(AccountQueries, AsyncBaseRepository[Account]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(Account, session)
+
+    async def list_page(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filter_by: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Account], Decimal, int]:
+        rows = (await self.session.execute(self.page_query(offset, limit, filter_by))).all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total_balance, rows[0].total_count
+        total_balance, total_count = (await self.session.execute(self.totals_query(filter_by))).one()
+        return [], total_balance, total_count
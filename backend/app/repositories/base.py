@@ -1,31 +1,70 @@
-from typing import Any, Dict, Optional, Generic, Sequence, TypeVar, Type
-from sqlalchemy import select
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Generic, Sequence, Tuple, TypeVar, Type
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
 ModelType = TypeVar("ModelType")
 
-class BaseRepository(Generic[ModelType]):
-    def __init__(self, model: Type[ModelType], session: Session):
+# linhas (ou ids) por instrução nas operações em lote; mantém o IN (...) e o
+# executemany abaixo do limite de parâmetros dos bancos
+BULK_BATCH_SIZE = 500
+
+def chunked(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def group_updates(id_to_values: Dict[int, Dict[str, Any]]) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+    """Agrupa as alterações pelo conjunto de colunas, já com os nomes dos parâmetros.
+
+    Ids sem colunas a alterar ficam de fora: não há UPDATE com SET vazio.
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for id, values in id_to_values.items():
+        if not values:
+            continue
+        columns = tuple(sorted(values))
+        params = {f"v_{column}": values[column] for column in columns}
+        params["b_id"] = id
+        groups.setdefault(columns, []).append(params)
+    return groups
+
+class QueryBuilder(Generic[ModelType]):
+    """Monta as consultas; a execução fica com os repositórios síncrono e assíncrono"""
+
+    # coluna que indica o dono da linha nas operações em lote com owner_id
+    owner_column = "user_id"
+
+    def __init__(self, model: Type[ModelType]):
         self.model = model
-        self.session = session
         self.model_columns = {column.name for column in self.model.__table__.columns}
 
-    def create(self, data: dict) -> ModelType:
-        obj = self.model(**data)
-        self.session.add(obj)
-        # self.session.commit()
-        self.session.flush()
-        self.session.refresh(obj)
-        return obj
+    def _where_owner(self, query, owner_id: Optional[int]):
+        if owner_id is None:
+            return query
+        return query.where(self.model.__table__.c[self.owner_column] == owner_id)
 
-    def list_all(
+    def bulk_update_query(self, columns: Iterable[str], owner_id: Optional[int] = None):
+        """UPDATE por id para executemany; os valores vêm como v_<coluna> e o id como b_id"""
+        table = self.model.__table__
+        query = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values({column: bindparam(f"v_{column}") for column in columns})
+        )
+        return self._where_owner(query, owner_id)
+
+    def bulk_delete_query(self, ids: Sequence[int], owner_id: Optional[int] = None):
+        table = self.model.__table__
+        return self._where_owner(delete(table).where(table.c.id.in_(ids)), owner_id)
+
+    def list_query(
         self,
         offset: int = 0,
         limit: int = 100,
         filter_by: Optional[Dict[str, Any]] = None,
         order_by: Optional[Dict[str, str]] = None
-    ) -> Sequence[ModelType]:
+    ):
         query = select(self.model)
         if filter_by:
             for key, value in filter_by.items():
@@ -41,14 +80,87 @@ class BaseRepository(Generic[ModelType]):
                         query = query.order_by(getattr(self.model, column).desc())
                     else:
                         query = query.order_by(getattr(self.model, column).asc())
-        query = query.offset(offset).limit(limit)
+        return query.offset(offset).limit(limit)
+
+
+class BaseRepository(QueryBuilder[ModelType]):
+    def __init__(self, model: Type[ModelType], session: Session):
+        super().__init__(model)
+        self.session = session
+
+    def create(self, data: dict, refresh: bool = False) -> ModelType:
+        """Insere e faz o flush; o id volta no próprio INSERT.
+
+        refresh=True relê a linha, para obter valores calculados pelo banco que
+        o modelo não busca via eager_defaults (ou normalizados por ele, como Numeric).
+        """
+        obj = self.model(**data)
+        self.session.add(obj)
+        # self.session.commit()
+        self.session.flush()
+        if refresh:
+            self.session.refresh(obj)
+        return obj
+
+    def list_all(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filter_by: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Dict[str, str]] = None
+    ) -> Sequence[ModelType]:
+        query = self.list_query(offset, limit, filter_by, order_by)
         result = self.session.execute(query)
         return result.scalars().all()
 
     def get(self, id: int) -> Optional[ModelType]:
         return self.session.get(self.model, id)
 
-    def update(self, id: int, data: dict) -> Optional[ModelType]:
+    def create_many(self, rows: Sequence[Dict[str, Any]]) -> List[ModelType]:
+        """Cria os objetos com um único flush; o ORM agrupa os INSERTs e preenche os ids"""
+        objs = [self.model(**data) for data in rows]
+        self.session.add_all(objs)
+        self.session.flush()
+        return objs
+
+    def bulk_create(self, rows: Sequence[Dict[str, Any]], batch_size: int = BULK_BATCH_SIZE) -> int:
+        """Insere as linhas com executemany, sem criar objetos na sessão"""
+        for batch in chunked(rows, batch_size):
+            self.session.execute(insert(self.model), batch)
+        return len(rows)
+
+    def bulk_update(
+        self,
+        id_to_values: Dict[int, Dict[str, Any]],
+        owner_id: Optional[int] = None,
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> Optional[int]:
+        """Atualiza várias linhas por id; com owner_id, linhas de outro dono são ignoradas.
+
+        Retorna quantas linhas foram alteradas, ou None se o driver não informa
+        o rowcount de executemany. Objetos já carregados na sessão não são atualizados.
+        """
+        supported = self.session.get_bind().dialect.supports_sane_multi_rowcount
+        updated = 0
+        for columns, params in group_updates(id_to_values).items():
+            query = self.bulk_update_query(columns, owner_id)
+            for batch in chunked(params, batch_size):
+                updated += self.session.execute(query, batch).rowcount
+        return updated if supported else None
+
+    def bulk_delete(
+        self,
+        ids: Sequence[int],
+        owner_id: Optional[int] = None,
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> int:
+        """Remove as linhas pelos ids num DELETE por lote; retorna quantas foram removidas"""
+        deleted = 0
+        for batch in chunked(list(ids), batch_size):
+            deleted += self.session.execute(self.bulk_delete_query(batch, owner_id)).rowcount
+        return deleted
+
+    def update(self, id: int, data: dict, refresh: bool = False) -> Optional[ModelType]:
         obj = self.get(id)
         if obj is None:
             return None
@@ -56,7 +168,8 @@ class BaseRepository(Generic[ModelType]):
             setattr(obj, key, value)
         # self.session.commit()
         self.session.flush()
-        self.session.refresh(obj)
+        if refresh:
+            self.session.refresh(obj)
         return obj
 
     def delete(self, id: int) -> bool:
@@ -66,4 +179,27 @@ class BaseRepository(Generic[ModelType]):
         self.session.delete(obj)
         # self.session.commit()
         self.session.flush()
-        return True
\ No newline at end of file
+        return True
+
+
+class AsyncBaseRepository(QueryBuilder[ModelType]):
+    """Repositório da pilha assíncrona, que só atende leituras; as escritas
+    continuam no BaseRepository, na sessão síncrona"""
+
+    def __init__(self, model: Type[ModelType], session: AsyncSession):
+        super().__init__(model)
+        self.session = session
+
+    async def list_all(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filter_by: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Dict[str, str]] = None
+    ) -> Sequence[ModelType]:
+        query = self.list_query(offset, limit, filter_by, order_by)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get(self, id: int) -> Optional[ModelType]:
+        return await self.session.get(self.model, id)
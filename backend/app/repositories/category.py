@@ -1,8 +1,14 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.category import Category
-from app.repositories.base import BaseRepository
+from app.repositories.base import AsyncBaseRepository, BaseRepository
 
 
 class CategoryRepository(BaseRepository):
     def __init__(self, session: Session):
-        super().__init__(Category, session)
\ No newline at end of file
+        super().__init__(Category, session)
+
+
+class AsyncCategoryRepository(AsyncBaseRepository[Category]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(Category, session)
@@ -0,0 +1,169 @@
+import calendar
+from decimal import Decimal
+from typing import Any, Dict, Tuple
+from sqlalchemy import delete, extract, func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.category import Category
+from app.models.rollup import TransactionRollup
+from app.models.transaction import Transaction
+from app.repositories.base import AsyncBaseRepository, BaseRepository, QueryBuilder
+
+
+# (user_id, account_id, category_id, year, month)
+RollupKey = Tuple[int, int, int, int, int]
+RollupDeltas = Dict[RollupKey, Tuple[Decimal, int]]
+
+ROLLUP_FILTERS = {
+    "user_id", "account_id", "category_id", "category_type",
+    "start_date", "end_date", "month", "year",
+}
+
+
+def rollup_key(transaction: Transaction) -> RollupKey:
+    return (
+        transaction.user_id,
+        transaction.account_id,
+        transaction.category_id,
+        transaction.date.year,
+        transaction.date.month,
+    )
+
+
+def add_delta(deltas: RollupDeltas, key: RollupKey, amount: Decimal, count: int):
+    total, rows = deltas.get(key, (Decimal(0), 0))
+    deltas[key] = (total + amount, rows + count)
+
+
+class TransactionRollupQueries(QueryBuilder[TransactionRollup]):
+    def covers(self, filter_by: Dict[str, Any]) -> bool:
+        """Indica se os filtros caem em meses inteiros e podem ser atendidos pelo rollup"""
+        if not set(filter_by) <= ROLLUP_FILTERS:
+            return False
+        start_date = filter_by.get("start_date")
+        if start_date and start_date.day != 1:
+            return False
+        end_date = filter_by.get("end_date")
+        if end_date and end_date.day != calendar.monthrange(end_date.year, end_date.month)[1]:
+            return False
+        return True
+
+    def summary_query(self, filter_by: Dict[str, Any]):
+        query = select(
+            Category,
+            func.sum(self.model.total).label("total")
+        ).join(Category, self.model.category_id == Category.id)
+        query = query.where(self.model.user_id == filter_by["user_id"])
+        if filter_by.get("account_id"):
+            query = query.where(self.model.account_id == filter_by["account_id"])
+        if filter_by.get("category_id"):
+            query = query.where(self.model.category_id.in_(filter_by["category_id"]))
+        if filter_by.get("category_type"):
+            query = query.where(Category.category_type == filter_by["category_type"])
+        if filter_by.get("year"):
+            query = query.where(self.model.year == filter_by["year"])
+        if filter_by.get("month"):
+            query = query.where(self.model.month == filter_by["month"])
+        period = tuple_(self.model.year, self.model.month)
+        if filter_by.get("start_date"):
+            start_date = filter_by["start_date"]
+            query = query.where(period >= tuple_(start_date.year, start_date.month))
+        if filter_by.get("end_date"):
+            end_date = filter_by["end_date"]
+            query = query.where(period <= tuple_(end_date.year, end_date.month))
+        return query.group_by(Category.id).having(func.sum(self.model.count) > 0)
+
+
+class TransactionRollupRepository(TransactionRollupQueries, BaseRepository[TransactionRollup]):
+    def __init__(self, session: Session):
+        super().__init__(TransactionRollup, session)
+
+    def _insert(self):
+        if self.session.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(self.model)
+        return sqlite.insert(self.model)
+
+    def apply_deltas(self, deltas: RollupDeltas):
+        rows = [
+            {
+                "user_id": user_id,
+                "account_id": account_id,
+                "category_id": category_id,
+                "year": year,
+                "month": month,
+                "total": total,
+                "count": count,
+            }
+            for (user_id, account_id, category_id, year, month), (total, count) in deltas.items()
+            if total or count
+        ]
+        if not rows:
+            return
+        stmt = self._insert()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "account_id", "category_id", "year", "month"],
+            set_={
+                "total": self.model.total + stmt.excluded.total,
+                "count": self.model.count + stmt.excluded.count,
+            },
+        )
+        self.session.execute(stmt, rows)
+
+    def get_summary(self, filter_by: Dict[str, Any]):
+        return self.session.execute(self.summary_query(filter_by)).all()
+
+    def _live_query(self):
+        year = extract("year", Transaction.date)
+        month = extract("month", Transaction.date)
+        return select(
+            Transaction.user_id,
+            Transaction.account_id,
+            Transaction.category_id,
+            year.label("year"),
+            month.label("month"),
+            func.sum(Transaction.amount).label("total"),
+            func.count().label("count"),
+        ).group_by(
+            Transaction.user_id,
+            Transaction.account_id,
+            Transaction.category_id,
+            year,
+            month,
+        )
+
+    def rebuild(self) -> int:
+        """Recalcula todo o rollup a partir da tabela de transações"""
+        self.session.execute(delete(self.model))
+        columns = ["user_id", "account_id", "category_id", "year", "month", "total", "count"]
+        self.session.execute(self.model.__table__.insert().from_select(columns, self._live_query()))
+        return self.session.execute(select(func.count()).select_from(self.model)).scalar()
+
+    def find_mismatches(self) -> int:
+        """Conta as chaves em que o rollup diverge do agregado calculado na hora"""
+        live = self._live_query().subquery()
+        live_rows = select(
+            live.c.user_id, live.c.account_id, live.c.category_id,
+            live.c.year, live.c.month,
+            func.round(live.c.total, 2), live.c["count"],
+        )
+        rollup_rows = select(
+            self.model.user_id, self.model.account_id, self.model.category_id,
+            self.model.year, self.model.month,
+            func.round(self.model.total, 2), self.model.count,
+        ).where(self.model.count > 0)
+        missing = live_rows.except_(rollup_rows).subquery()
+        extra = rollup_rows.except_(live_rows).subquery()
+        return self.session.execute(
+            select(func.count()).select_from(missing)
+        ).scalar() + self.session.execute(
+            select(func.count()).select_from(extra)
+        ).scalar()
+
+
+class AsyncTransactionRollupRepository(TransactionRollupQueries, AsyncBaseRepository[TransactionRollup]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(TransactionRollup, session)
+
+    async def get_summary(self, filter_by: Dict[str, Any]):
+        return (await self.session.execute(self.summary_query(filter_by))).all()
@@ -1,4 +1,5 @@
-from sqlalchemy import select
+from datetime import datetime
+from sqlalchemy import delete, or_, select
 from sqlalchemy.orm import Session
 from app.models.session import UserSession
 from app.repositories.base import BaseRepository
@@ -11,4 +12,25 @@ class UserSessionRepository(BaseRepository):
     def find_by_token(self, token: str):
         stmt = select(UserSession).where(UserSession.token == token)
         result = self.session.execute(stmt)
-        return result.scalar_one_or_none()
\ No newline at end of file
+        return result.scalar_one_or_none()
+
+    def expired_ids_query(self, now: datetime, batch_size: int):
+        """Ids de até batch_size sessões expiradas ou revogadas.
+
+        Cada lado do OR tem um índice (expires_at e o parcial de revoked), e o
+        SQLite os combina (MULTI-INDEX OR) em vez de varrer a tabela.
+        """
+        return (
+            select(UserSession.id)
+            .where(or_(UserSession.expires_at < now, UserSession.revoked == 1))
+            .limit(batch_size)
+        )
+
+    def delete_expired(self, now: datetime, batch_size: int) -> int:
+        """Remove até batch_size sessões expiradas ou revogadas"""
+        stmt = (
+            delete(UserSession)
+            .where(UserSession.id.in_(self.expired_ids_query(now, batch_size).scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(stmt).rowcount
\ No newline at end of file
@@ -1,14 +1,33 @@
-from typing import Any, Dict, Optional
-from sqlalchemy import Sequence, extract, func, select
-from sqlalchemy.orm import Session
+import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import Sequence, extract, false, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from app.models.account import Account
 from app.models.category import Category
 from app.models.transaction import Transaction
-from app.repositories.base import BaseRepository
+from app.repositories.base import AsyncBaseRepository, BaseRepository, QueryBuilder
 
 
-class TransactionRepository(BaseRepository):
-    def __init__(self, session: Session):
-        super().__init__(Transaction, session)
+def _period_range(year: int, month: Optional[int] = None) -> Tuple[datetime.date, datetime.date]:
+    """Retorna o intervalo semiaberto [início, fim) do mês ou do ano informado"""
+    if month is None:
+        return datetime.date(year, 1, 1), datetime.date(year + 1, 1, 1)
+    start = datetime.date(year, month, 1)
+    if month == 12:
+        return start, datetime.date(year + 1, 1, 1)
+    return start, datetime.date(year, month + 1, 1)
+
+
+class TransactionQueries(QueryBuilder[Transaction]):
+    """Consultas de transações compartilhadas pelos repositórios síncrono e assíncrono"""
+
+    def _load_options(self):
+        # categoria e conta vêm no mesmo SELECT, evitando N+1 ao montar os DTOs
+        return (
+            joinedload(self.model.category, innerjoin=True),
+            joinedload(self.model.account, innerjoin=True),
+        )
 
     def _apply_filters(self, query, filter_by: Dict[str, Any]):
         """Método auxiliar para aplicar os filtros comuns"""
@@ -18,12 +37,26 @@ class TransactionRepository(BaseRepository):
             query = query.where(self.model.date >= filter_by['start_date'])
         if 'end_date' in filter_by and filter_by['end_date']:
             query = query.where(self.model.date <= filter_by['end_date'])
-        if 'month' in filter_by and filter_by['month']:
-            query = query.where(extract('month', self.model.date) == filter_by['month'])
-        if 'year' in filter_by and filter_by['year']:
-            query = query.where(extract('year', self.model.date) == filter_by['year'])
+        if 'date' in filter_by and filter_by['date']:
+            day = filter_by['date']
+            if day == datetime.date.max:
+                query = query.where(self.model.date >= day)
+            else:
+                query = self._where_date_range(query, day, day + datetime.timedelta(days=1))
+        month = filter_by.get('month') or None
+        year = filter_by.get('year') or None
+        if year:
+            # intervalos de datas permitem o uso dos índices em `date`,
+            # ao contrário de extract(), que é avaliado linha a linha
+            try:
+                start, end = _period_range(year, month)
+            except (ValueError, OverflowError):
+                return query.where(false())
+            query = self._where_date_range(query, start, end)
+        elif month:
+            query = query.where(extract('month', self.model.date) == month)
         for key, value in filter_by.items():
-            if key in ['start_date', 'end_date', 'month', 'year']:
+            if key in ['start_date', 'end_date', 'date', 'month', 'year']:
                 continue
             if hasattr(self.model, key):
                 if isinstance(value, list):
@@ -31,38 +64,215 @@ class TransactionRepository(BaseRepository):
                 else:
                     query = query.where(getattr(self.model, key) == value)
         return query
-    
-    def count_rows(self, filter_by: Optional[Dict[str, Any]] = None):
+
+    def _where_date_range(self, query, start: datetime.date, end: datetime.date):
+        return query.where(self.model.date >= start, self.model.date < end)
+
+    def count_query(self, filter_by: Optional[Dict[str, Any]] = None):
         query = select(func.count(self.model.id))
-        query = self._apply_filters(query, filter_by)
-        result = self.session.execute(query)
-        return result.scalar()
+        return self._apply_filters(query, filter_by)
 
-    def list_all(
+    def list_query(
         self,
         offset: int = 0,
         limit: int = 100,
         filter_by: Optional[Dict[str, Any]] = None,
-        order_by: Optional[Dict[str, str]] = None
-    ) -> Sequence[Transaction]:
-        query = select(self.model)
+        order_by: Optional[Dict[str, str]] = None,
+        after: Optional[Tuple[Any, int]] = None
+    ):
+        query = select(self.model).options(*self._load_options())
         query = self._apply_filters(query, filter_by)
+        descending = False
         if order_by:
             for column, direction in order_by.items():
                 if hasattr(self.model, column):
-                    if direction.lower() == 'desc':
+                    descending = direction.lower() == 'desc'
+                    if descending:
                         query = query.order_by(getattr(self.model, column).desc())
                     else:
                         query = query.order_by(getattr(self.model, column).asc())
-        query = query.offset(offset).limit(limit)
-        result = self.session.execute(query)
-        return result.scalars().all()
-    
-    def get_summary(self, filter_by: Dict[str, Any]):
+        if after is not None:
+            query = self._apply_keyset(query, order_by, after)
+        # o id desempata valores iguais e mantém a ordem estável entre páginas
+        query = query.order_by(self.model.id.desc() if descending else self.model.id.asc())
+        return query.offset(offset).limit(limit)
+
+    def _apply_keyset(self, query, order_by: Optional[Dict[str, str]], after: Tuple[Any, int]):
+        """Mantém apenas as linhas que vêm depois da chave (valor, id) informada"""
+        last_value, last_id = after
+        if not order_by:
+            return query.where(self.model.id > last_id)
+        column, direction = next(iter(order_by.items()))
+        sort_column = getattr(self.model, column)
+        if direction.lower() == 'desc':
+            return query.where(
+                sort_column <= last_value,
+                or_(sort_column < last_value, self.model.id < last_id)
+            )
+        return query.where(
+            sort_column >= last_value,
+            or_(sort_column > last_value, self.model.id > last_id)
+        )
+
+    def page_query(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filter_by: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Dict[str, str]] = None,
+        after: Optional[Tuple[Any, int]] = None
+    ):
+        # subconsulta escalar não correlacionada: o SQLite a avalia uma única
+        # vez pelo índice de cobertura e mantém o ORDER BY ... LIMIT pelo índice,
+        # enquanto COUNT(*) OVER () obrigaria a ordenar todo o conjunto filtrado
+        total = self.count_query(filter_by).scalar_subquery().label("total_count")
+        return self.list_query(offset, limit, filter_by, order_by, after).add_columns(total)
+
+    def export_query(
+        self,
+        filter_by: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Dict[str, str]] = None
+    ):
+        query = select(
+            self.model.id,
+            self.model.date,
+            self.model.amount,
+            self.model.category_type,
+            self.model.category_id,
+            Category.name.label("category_name"),
+            self.model.account_id,
+            Account.name.label("account_name"),
+            self.model.comment,
+        ).join(Category, self.model.category_id == Category.id
+        ).join(Account, self.model.account_id == Account.id)
+        query = self._apply_filters(query, filter_by)
+        descending = False
+        for column, direction in (order_by or {}).items():
+            if hasattr(self.model, column):
+                descending = direction.lower() == 'desc'
+                column = getattr(self.model, column)
+                query = query.order_by(column.desc() if descending else column.asc())
+        return query.order_by(self.model.id.desc() if descending else self.model.id.asc())
+
+    def summary_query(self, filter_by: Dict[str, Any]):
         query = select(
             Category,
             func.sum(self.model.amount).label("total")
         ).join(Category, self.model.category_id == Category.id)
         query = self._apply_filters(query, filter_by)
-        query = query.group_by(Category.id)
-        return self.session.execute(query).all()
\ No newline at end of file
+        return query.group_by(Category.id)
+
+
+class TransactionRepository(TransactionQueries, BaseRepository[Transaction]):
+    def __init__(self, session: Session):
+        super().__init__(Transaction, session)
+
+    def get(self, id: int, populate_existing: bool = False) -> Optional[Transaction]:
+        return self.session.get(
+            self.model,
+            id,
+            options=self._load_options(),
+            populate_existing=populate_existing,
+        )
+
+    def count_rows(self, filter_by: Optional[Dict[str, Any]] = None):
+        result = self.session.execute(self.count_query(filter_by))
+        return result.scalar()
+
+    def list_all(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filter_by: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Dict[str, str]] = None,
+        after: Optional[Tuple[Any, int]] = None
+    ) -> Sequence[Transaction]:
+        query = self.list_query(offset, limit, filter_by, order_by, after)
+        result = self.session.execute(query)
+        return result.scalars().all()
+
+    def list_page(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filter_by: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Dict[str, str]] = None,
+        after: Optional[Tuple[Any, int]] = None,
+        with_total: bool = True
+    ) -> Tuple[List[Transaction], Optional[int]]:
+        """Retorna a página e o total de linhas filtradas numa única consulta"""
+        if not with_total:
+            return list(self.list_all(offset, limit, filter_by, order_by, after)), None
+        query = self.page_query(offset, limit, filter_by, order_by, after)
+        rows = self.session.execute(query).all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total_count
+        if offset == 0 and after is None:
+            return [], 0
+        # página vazia após o fim: o total precisa ser contado à parte
+        return [], self.count_rows(filter_by) or 0
+
+    def stream_rows(
+        self,
+        filter_by: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Dict[str, str]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Any]:
+        """Percorre as linhas em lotes pelo cursor, sem materializar o resultado"""
+        query = self.export_query(filter_by, order_by).execution_options(yield_per=batch_size)
+        for partition in self.session.execute(query).partitions():
+            yield from partition
+
+    def get_summary(self, filter_by: Dict[str, Any]):
+        return self.session.execute(self.summary_query(filter_by)).all()
+
+
+class AsyncTransactionRepository(TransactionQueries, AsyncBaseRepository[Transaction]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(Transaction, session)
+
+    async def get(self, id: int, populate_existing: bool = False) -> Optional[Transaction]:
+        return await self.session.get(
+            self.model,
+            id,
+            options=self._load_options(),
+            populate_existing=populate_existing,
+        )
+
+    async def count_rows(self, filter_by: Optional[Dict[str, Any]] = None):
+        result = await self.session.execute(self.count_query(filter_by))
+        return result.scalar()
+
+    async def list_all(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filter_by: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Dict[str, str]] = None,
+        after: Optional[Tuple[Any, int]] = None
+    ) -> Sequence[Transaction]:
+        query = self.list_query(offset, limit, filter_by, order_by, after)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def list_page(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filter_by: Optional[Dict[str, Any]] = None,
+        order_by: Optional[Dict[str, str]] = None,
+        after: Optional[Tuple[Any, int]] = None,
+        with_total: bool = True
+    ) -> Tuple[List[Transaction], Optional[int]]:
+        if not with_total:
+            return list(await self.list_all(offset, limit, filter_by, order_by, after)), None
+        query = self.page_query(offset, limit, filter_by, order_by, after)
+        rows = (await self.session.execute(query)).all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total_count
+        if offset == 0 and after is None:
+            return [], 0
+        return [], await self.count_rows(filter_by) or 0
+
+    async def get_summary(self, filter_by: Dict[str, Any]):
+        return (await self.session.execute(self.summary_query(filter_by))).all()
@@ -1,15 +1,19 @@
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, Query, status
-from app.dependencies import get_account_service
+from app.config import settings
+from app.dependencies import get_async_account_service, get_account_read_service, get_account_service
+from app.profiling import ProfilingRoute
 from app.schemas.account import AccountCreateDTO, AccountFilters, AccountResponseDTO, AccountResponseWithTotal, AccountUpdateDTO
 from app.schemas.auth import AuthData
-from app.security import authorize
-from app.services.account import AccountService
+from app.security import authorize, authorize_async
+from app.services.account import AsyncAccountService, AccountService
 
 
-router = APIRouter(prefix="/accounts", tags=["Account"])
+router = APIRouter(prefix="/accounts", tags=["Account"], route_class=ProfilingRoute)
 
 Service = Annotated[AccountService, Depends(get_account_service)]
+ReadService = Annotated[AccountService, Depends(get_account_read_service)]
+AsyncService = Annotated[AsyncAccountService, Depends(get_async_account_service)]
 
 @router.post("/", response_model=AccountResponseDTO, status_code=status.HTTP_201_CREATED)
 def create_account(
@@ -19,21 +23,39 @@ def create_account(
 ):
     return service.create(data, auth.user_id)
 
-@router.get("/", response_model=AccountResponseWithTotal)
-def list_accounts(
-    filters: Annotated[AccountFilters, Query()],
-    service: Service,
-    auth: AuthData = Depends(authorize)
-):
-    return service.list_all(filters, auth.user_id)
+if settings.async_database:
+    @router.get("/", response_model=AccountResponseWithTotal)
+    async def list_accounts(
+        filters: Annotated[AccountFilters, Query()],
+        service: AsyncService,
+        auth: AuthData = Depends(authorize_async)
+    ):
+        return await service.list_all(filters, auth.user_id)
+else:
+    @router.get("/", response_model=AccountResponseWithTotal)
+    def list_accounts(
+        filters: Annotated[AccountFilters, Query()],
+        service: ReadService,
+        auth: AuthData = Depends(authorize)
+    ):
+        return service.list_all(filters, auth.user_id)
 
-@router.get("/{id}", response_model=AccountResponseDTO)
-def get_account(
-    id: int,
-    service: Service,
-    auth: AuthData = Depends(authorize)
-):
-    return service.get(id, auth.user_id)
+if settings.async_database:
+    @router.get("/{id}", response_model=AccountResponseDTO)
+    async def get_account(
+        id: int,
+        service: AsyncService,
+        auth: AuthData = Depends(authorize_async)
+    ):
+        return await service.get(id, auth.user_id)
+else:
+    @router.get("/{id}", response_model=AccountResponseDTO)
+    def get_account(
+        id: int,
+        service: ReadService,
+        auth: AuthData = Depends(authorize)
+    ):
+        return service.get(id, auth.user_id)
 
 @router.patch("/{id}", response_model=AccountResponseDTO)
 def update_account(
@@ -2,22 +2,23 @@ from datetime import timezone, datetime
 from typing import Annotated
 from fastapi import APIRouter, Depends, Response
 from app.dependencies import get_auth_service
+from app.profiling import ProfilingRoute
 from app.schemas.auth import AuthData, LoginDTO
 from app.security import authorize
 from app.services.auth import AuthService
 
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=ProfilingRoute)
 
 Service = Annotated[AuthService, Depends(get_auth_service)]
 
 @router.post("/login")
-def login(
+async def login(
     data: LoginDTO,
     response: Response,
     service: Service
 ):
-    session_data = service.login(data)
+    session_data = await service.login(data)
     expires_utc = session_data.expires_at
     if expires_utc.tzinfo is None:
         expires_utc = expires_utc.replace(tzinfo=timezone.utc)
@@ -1,15 +1,19 @@
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, Query, status
-from app.dependencies import get_category_service
+from app.config import settings
+from app.dependencies import get_async_category_service, get_category_read_service, get_category_service
+from app.profiling import ProfilingRoute
 from app.schemas.auth import AuthData
 from app.schemas.category import CategoryCreateDTO, CategoryFilters, CategoryResponseDTO, CategoryUpdateDTO
-from app.security import authorize
-from app.services.category import CategoryService
+from app.security import authorize, authorize_async
+from app.services.category import AsyncCategoryService, CategoryService
 
 
-router = APIRouter(prefix="/categories", tags=["Category"])
+router = APIRouter(prefix="/categories", tags=["Category"], route_class=ProfilingRoute)
 
 Service = Annotated[CategoryService, Depends(get_category_service)]
+ReadService = Annotated[CategoryService, Depends(get_category_read_service)]
+AsyncService = Annotated[AsyncCategoryService, Depends(get_async_category_service)]
 
 @router.post("/", response_model=CategoryResponseDTO, status_code=status.HTTP_201_CREATED)
 def create_category(
@@ -19,21 +23,39 @@ def create_category(
 ):
     return service.create(data, auth.user_id)
 
-@router.get("/", response_model=List[CategoryResponseDTO])
-def list_categories(
-    filters: Annotated[CategoryFilters, Query()],
-    service: Service,
-    auth: AuthData = Depends(authorize)
-):
-    return service.list_all(filters, auth.user_id)
+if settings.async_database:
+    @router.get("/", response_model=List[CategoryResponseDTO])
+    async def list_categories(
+        filters: Annotated[CategoryFilters, Query()],
+        service: AsyncService,
+        auth: AuthData = Depends(authorize_async)
+    ):
+        return await service.list_all(filters, auth.user_id)
+else:
+    @router.get("/", response_model=List[CategoryResponseDTO])
+    def list_categories(
+        filters: Annotated[CategoryFilters, Query()],
+        service: ReadService,
+        auth: AuthData = Depends(authorize)
+    ):
+        return service.list_all(filters, auth.user_id)
 
-@router.get("/{id}", response_model=CategoryResponseDTO)
-def get_category(
-    id: int,
-    service: Service,
-    auth: AuthData = Depends(authorize)
-):
-    return service.get(id, auth.user_id)
+if settings.async_database:
+    @router.get("/{id}", response_model=CategoryResponseDTO)
+    async def get_category(
+        id: int,
+        service: AsyncService,
+        auth: AuthData = Depends(authorize_async)
+    ):
+        return await service.get(id, auth.user_id)
+else:
+    @router.get("/{id}", response_model=CategoryResponseDTO)
+    def get_category(
+        id: int,
+        service: ReadService,
+        auth: AuthData = Depends(authorize)
+    ):
+        return service.get(id, auth.user_id)
 
 @router.patch("/{id}", response_model=CategoryResponseDTO)
 def update_category(
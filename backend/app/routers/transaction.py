@@ -1,22 +1,33 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, Query, status
-from app.dependencies import get_transaction_service
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Depends, Form, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.dependencies import get_async_transaction_service, get_transaction_read_service, get_transaction_service
+from app.profiling import ProfilingRoute
 from app.schemas.auth import AuthData
 from app.schemas.transaction import (
+    ExportFormat,
+    ImportFormat,
+    TransactionBatchRequest,
+    TransactionBatchResult,
     TransactionCreateDTO,
+    TransactionExportFilters,
     TransactionFilters,
+    TransactionImportResult,
     TransactionResponseDTO,
     TransactionResponsePagination,
     TransactionSummaryWithTotal,
     TransactionUpdateDTO
 )
-from app.security import authorize
-from app.services.transaction import TransactionService
+from app.security import authorize, authorize_async
+from app.services.transaction import AsyncTransactionService, TransactionService
 
 
-router = APIRouter(prefix="/transactions", tags=["Transaction"])
+router = APIRouter(prefix="/transactions", tags=["Transaction"], route_class=ProfilingRoute)
 
 Service = Annotated[TransactionService, Depends(get_transaction_service)]
+ReadService = Annotated[TransactionService, Depends(get_transaction_read_service)]
+AsyncService = Annotated[AsyncTransactionService, Depends(get_async_transaction_service)]
 
 @router.post("/", response_model=TransactionResponseDTO, status_code=status.HTTP_201_CREATED)
 def create_transaction(
@@ -26,21 +37,88 @@ def create_transaction(
 ):
     return service.create(data, auth.user_id)
 
-@router.get("/", response_model=TransactionResponsePagination | TransactionSummaryWithTotal)
-def list_transactions(
-    filters: Annotated[TransactionFilters, Query()],
+@router.post("/import", response_model=TransactionImportResult)
+def import_transactions(
+    file: UploadFile,
     service: Service,
+    file_format: Annotated[Optional[ImportFormat], Form(alias="format")] = None,
+    account_id: Annotated[Optional[int], Form()] = None,
+    category_id: Annotated[Optional[int], Form()] = None,
+    income_category_id: Annotated[Optional[int], Form()] = None,
+    expense_category_id: Annotated[Optional[int], Form()] = None,
     auth: AuthData = Depends(authorize)
 ):
-    return service.list_all(filters, auth.user_id)
+    return service.import_file(
+        file.file,
+        file.filename,
+        file_format,
+        auth.user_id,
+        default_account_id=account_id,
+        default_category_id=category_id,
+        income_category_id=income_category_id,
+        expense_category_id=expense_category_id,
+    )
 
-@router.get("/{id}", response_model=TransactionResponseDTO)
-def get_transaction(
-    id: int,
+@router.post("/batch", response_model=TransactionBatchResult)
+def batch_transactions(
+    data: TransactionBatchRequest,
     service: Service,
     auth: AuthData = Depends(authorize)
 ):
-    return service.get(id, auth.user_id)
+    return service.batch(data.operations, auth.user_id)
+
+if settings.async_database:
+    @router.get("/", response_model=TransactionResponsePagination | TransactionSummaryWithTotal)
+    async def list_transactions(
+        filters: Annotated[TransactionFilters, Query()],
+        service: AsyncService,
+        auth: AuthData = Depends(authorize_async)
+    ):
+        return await service.list_all(filters, auth.user_id)
+else:
+    @router.get("/", response_model=TransactionResponsePagination | TransactionSummaryWithTotal)
+    def list_transactions(
+        filters: Annotated[TransactionFilters, Query()],
+        service: ReadService,
+        auth: AuthData = Depends(authorize)
+    ):
+        return service.list_all(filters, auth.user_id)
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv",
+    ExportFormat.ndjson: "application/x-ndjson",
+}
+
+@router.get("/export")
+def export_transactions(
+    filters: Annotated[TransactionExportFilters, Query()],
+    service: ReadService,
+    auth: AuthData = Depends(authorize)
+):
+    return StreamingResponse(
+        service.export(filters, auth.user_id, filters.format),
+        media_type=EXPORT_MEDIA_TYPES[filters.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="transacoes.{filters.format.value}"'
+        },
+    )
+
+if settings.async_database:
+    @router.get("/{id}", response_model=TransactionResponseDTO)
+    async def get_transaction(
+        id: int,
+        service: AsyncService,
+        auth: AuthData = Depends(authorize_async)
+    ):
+        return await service.get(id, auth.user_id)
+else:
+    @router.get("/{id}", response_model=TransactionResponseDTO)
+    def get_transaction(
+        id: int,
+        service: ReadService,
+        auth: AuthData = Depends(authorize)
+    ):
+        return service.get(id, auth.user_id)
 
 @router.patch("/{id}", response_model=TransactionResponseDTO)
 def update_transaction(
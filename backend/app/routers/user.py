@@ -1,19 +1,20 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, status
 from app.dependencies import get_user_service
+from app.profiling import ProfilingRoute
 from app.schemas.auth import AuthData
 from app.schemas.user import UserCreateDTO
 from app.security import authorize
 from app.services.user import UserService
 
 
-router = APIRouter(prefix="/users", tags=["User"])
+router = APIRouter(prefix="/users", tags=["User"], route_class=ProfilingRoute)
 
 Service = Annotated[UserService, Depends(get_user_service)]
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def create_user(data: UserCreateDTO, service: Service):
-    return service.create(data)
+async def create_user(data: UserCreateDTO, service: Service):
+    return await service.create(data)
 
 @router.delete("/{id}")
 def delete_user(
@@ -20,7 +20,9 @@ class AccountResponseDTO(AccountBase):
 
 
 class AccountResponseWithTotal(BaseModel):
-    total: Decimal = Field(max_digits=10, decimal_places=2)
+    # soma dos saldos de todas as contas do usuário, não só da página
+    total: Decimal = Field(decimal_places=2)
+    total_count: int
     accounts: List[AccountResponseDTO]
 
 
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, Field
 
 
@@ -7,6 +8,6 @@ class Pagination(BaseModel):
 
 
 class PaginationResponse(BaseModel):
-    total: int
+    total: Optional[int]
     offset: int
     limit: int
\ No newline at end of file
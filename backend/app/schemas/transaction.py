@@ -1,7 +1,7 @@
 import datetime
 from decimal import Decimal
 import enum
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional, Union
 from pydantic import BaseModel, ConfigDict, Field
 from app.models.category import CategoryType
 from app.schemas.account import AccountResponseDTO
@@ -32,6 +32,7 @@ class TransactionResponseDTO(TransactionBase):
 
 class TransactionResponsePagination(PaginationResponse):
     data: List[TransactionResponseDTO]
+    next_cursor: Optional[str] = None
 
 
 class TransactionUpdateDTO(BaseModel):
@@ -47,7 +48,8 @@ class OrderByOptions(enum.Enum):
     amount_asc = "amount:asc"
     amount_desc = "amount:desc"
 
-class TransactionFilters(Pagination):
+class TransactionFilterFields(BaseModel):
+    """Filtros comuns à listagem e à exportação, sem paginação"""
     category_type: Optional[CategoryType] = None
     category_id: Optional[List[int]] = None
     account_id: Optional[int] = None
@@ -57,7 +59,11 @@ class TransactionFilters(Pagination):
     end_date: Optional[datetime.date] = None
     month: Optional[int] = None
     year: Optional[int] = None
+
+class TransactionFilters(Pagination, TransactionFilterFields):
     summary: bool = False
+    cursor: Optional[str] = None
+    include_total: bool = True
 
 class TransactionSummaryDTO(BaseModel):
     category_id: int
@@ -69,4 +75,60 @@ class TransactionSummaryDTO(BaseModel):
 
 class TransactionSummaryWithTotal(BaseModel):
     total: float
-    summary: List[TransactionSummaryDTO]
\ No newline at end of file
+    summary: List[TransactionSummaryDTO]
+
+class ExportFormat(enum.Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+class TransactionExportFilters(TransactionFilterFields):
+    format: ExportFormat = ExportFormat.csv
+
+class ImportFormat(enum.Enum):
+    csv = "csv"
+    ofx = "ofx"
+
+class TransactionImportError(BaseModel):
+    row: int
+    message: str
+
+class TransactionImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TransactionImportError]
+
+MAX_BATCH_OPERATIONS = 1000
+
+class TransactionBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TransactionCreateDTO
+
+class TransactionBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TransactionUpdateDTO
+
+class TransactionBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+TransactionBatchOperation = Annotated[
+    Union[TransactionBatchCreate, TransactionBatchUpdate, TransactionBatchDelete],
+    Field(discriminator="op"),
+]
+
+class TransactionBatchRequest(BaseModel):
+    operations: List[TransactionBatchOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+class TransactionBatchOperationResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[int] = None
+    success: bool
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+class TransactionBatchResult(BaseModel):
+    applied: int
+    failed: int
+    results: List[TransactionBatchOperationResult]
@@ -1,35 +1,167 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
 from hashlib import sha256
-from typing import Optional
+from multiprocessing import get_context
+from threading import Lock
+from time import perf_counter
+from typing import Callable, NamedTuple, Optional, TypeVar
 from fastapi import Depends, Request, Response
-from pwdlib import PasswordHash
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.exceptions.auth import InvalidSession
+from app import hashing
+from app.cache import TTLCache
+from app.config import settings
+from app.database import get_async_db, get_db
+from app.exceptions.auth import InvalidSession, PasswordHashingBusy
+from app.metrics import (
+    auth_cache_requests,
+    password_hash_duration,
+    password_hash_queue_wait,
+    password_hash_rejected,
+)
 from app.models.session import UserSession
 from app.models.user import User
 from app.schemas.auth import AuthData
 
 
-pwd_context = PasswordHash.recommended()
+logger = logging.getLogger(__name__)
 
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
+T = TypeVar("T")
 
-def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+class PasswordHasherPool:
+    """Executa o Argon2 num pool de processos de tamanho fixo.
 
-def authorize(
-    request: Request, 
-    response: Response, 
-    db: Session = Depends(get_db)
-) -> AuthData:
+    A espera acontece no event loop (asyncio.Semaphore e asyncio.wrap_future),
+    sem ocupar threads do threadpool do servidor. O semáforo limita quantas
+    operações podem estar em execução ou na fila; quando não há vaga dentro
+    do timeout, a requisição falha com 503.
+    """
+
+    def __init__(self, workers: int, max_pending: int, queue_timeout: float):
+        self.workers = workers
+        self.max_slots = max(workers, 0) + max_pending
+        self.queue_timeout = queue_timeout
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # o semáforo pertence ao event loop; em produção há um só por processo
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_slots)
+            self._slots_loop = loop
+        return self._slots
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Descarta um pool quebrado (processo morto por OOM, segfault...)"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, fn: Callable[..., T], *args) -> T:
+        if self.workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+        executor = self._get_executor()
+        try:
+            return await asyncio.wrap_future(executor.submit(fn, *args))
+        except BrokenProcessPool:
+            # um processo que morreu quebra o pool inteiro: recria e tenta de novo uma vez
+            logger.warning("PasswordHasherPool quebrado; recriando os processos")
+            self._discard_executor(executor)
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        started = perf_counter()
+        slots = self._semaphore()
+        try:
+            await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+        except TimeoutError:
+            password_hash_rejected.inc()
+            raise PasswordHashingBusy
+        try:
+            result, elapsed = await self._submit(hashing.timed, fn, *args)
+        finally:
+            slots.release()
+        # o tempo do Argon2 é medido no worker; o restante é espera por vaga e pelo pool
+        password_hash_duration.observe(elapsed, fn.__name__)
+        password_hash_queue_wait.observe(max(perf_counter() - started - elapsed, 0.0), fn.__name__)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+argon2_params = (settings.argon2_time_cost, settings.argon2_memory_cost, settings.argon2_parallelism)
+
+password_hasher_pool = PasswordHasherPool(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+    queue_timeout=settings.password_hash_queue_timeout_seconds,
+)
+
+class CachedSession(NamedTuple):
+    user_id: int
+    name: str
+    expires_at: datetime
+
+# sessões já validadas, indexadas pelo hash do token: um acerto dispensa o banco
+session_cache: TTLCache[str, CachedSession] = TTLCache(
+    ttl_seconds=settings.session_cache_ttl_seconds,
+    max_entries=settings.session_cache_max_entries,
+)
+
+async def get_password_hash(password: str) -> str:
+    return await password_hasher_pool.run(hashing.hash_password, password, argon2_params)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher_pool.run(hashing.verify_password, plain_password, hashed_password, argon2_params)
+
+def invalidate_session(token_hash: str):
+    session_cache.pop(token_hash)
+
+def invalidate_user_sessions(user_id: int):
+    session_cache.pop_where(lambda cached: cached.user_id == user_id)
+
+def _session_token(request: Request) -> str:
     sid = request.cookies.get("sid")
     if not sid:
         raise InvalidSession
-    token_hash = sha256(sid.encode()).hexdigest()
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return sid
+
+def _cached_auth(sid: str, token_hash: str, refresh_before: datetime) -> Optional[AuthData]:
+    cached = session_cache.get(token_hash)
+    if cached is not None and cached.expires_at > refresh_before:
+        auth_cache_requests.inc(1, "hit")
+        return AuthData(user_id=cached.user_id, sid=sid, name=cached.name)
+    auth_cache_requests.inc(1, "miss")
+    return None
+
+def _authorize_from_db(
+    db: Session,
+    response: Response,
+    sid: str,
+    token_hash: str,
+    now: datetime,
+    refresh_before: datetime,
+) -> AuthData:
     query = (
         select(UserSession, User)
         .join(User, UserSession.user_id == User.id)
@@ -37,6 +169,7 @@ def authorize(
     )
     result = db.execute(query).first()
     def reject_auth(session_obj: Optional[UserSession] = None):
+        invalidate_session(token_hash)
         if session_obj:
             session_obj.revoked = 1
             session_obj.revoked_at = now
@@ -50,9 +183,16 @@ def authorize(
         reject_auth(user_session)
     if user_session.expires_at < now:
         reject_auth(user_session)
-    new_expires_at = now + timedelta(minutes=60)
+    if user_session.expires_at > refresh_before:
+        # ainda longe de expirar: nada a gravar nem cookie a renovar
+        cached = CachedSession(user_id=user.id, name=user.name, expires_at=user_session.expires_at)
+        session_cache.set(token_hash, cached)
+        return AuthData(user_id=cached.user_id, sid=sid, name=cached.name)
+    new_expires_at = now + timedelta(seconds=settings.session_expires_seconds)
     user_session.expires_at = new_expires_at
+    cached = CachedSession(user_id=user.id, name=user.name, expires_at=new_expires_at)
     db.commit()
+    session_cache.set(token_hash, cached)
     response.set_cookie(
         key="sid",
         value=sid,
@@ -60,6 +200,35 @@ def authorize(
         secure=True,
         samesite="lax",
         expires=new_expires_at.replace(tzinfo=timezone.utc),
-        max_age=3600,
+        max_age=settings.session_expires_seconds,
     )
-    return AuthData(user_id=user.id, sid=sid, name=user.name)
\ No newline at end of file
+    return AuthData(user_id=cached.user_id, sid=sid, name=cached.name)
+
+def authorize(
+    request: Request, 
+    response: Response, 
+    db: Session = Depends(get_db)
+) -> AuthData:
+    sid = _session_token(request)
+    token_hash = sha256(sid.encode()).hexdigest()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    refresh_before = now + timedelta(seconds=settings.session_refresh_threshold_seconds)
+    auth = _cached_auth(sid, token_hash, refresh_before)
+    if auth is not None:
+        return auth
+    return _authorize_from_db(db, response, sid, token_hash, now, refresh_before)
+
+async def authorize_async(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthData:
+    """Mesma validação do authorize, sem passar pelo threadpool"""
+    sid = _session_token(request)
+    token_hash = sha256(sid.encode()).hexdigest()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    refresh_before = now + timedelta(seconds=settings.session_refresh_threshold_seconds)
+    auth = _cached_auth(sid, token_hash, refresh_before)
+    if auth is not None:
+        return auth
+    return await db.run_sync(_authorize_from_db, response, sid, token_hash, now, refresh_before)
\ No newline at end of file
@@ -1,9 +1,48 @@
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.exceptions.account import AccountNotFound
-from app.repositories.account import AccountRepository
+from app.models.account import Account
+from app.reference_cache import account_cache
+from app.repositories.account import AccountRepository, AsyncAccountRepository
 from app.schemas.account import AccountCreateDTO, AccountFilters, AccountResponseDTO, AccountResponseWithTotal, AccountUpdateDTO
 
 
+def page_filters(filters: AccountFilters, user_id: int) -> Tuple[int, int, Dict[str, Any]]:
+    filter_dict = filters.model_dump(exclude_none=True, exclude_unset=True)
+    offset = filter_dict.pop("offset")
+    limit = filter_dict.pop("limit")
+    return offset, limit, {"user_id": user_id, **filter_dict}
+
+def page_from_cache(cached: Dict[int, AccountResponseDTO], filters: AccountFilters) -> AccountResponseWithTotal:
+    accounts = list(cached.values())
+    return AccountResponseWithTotal(
+        total=sum((account.balance for account in accounts), Decimal(0)),
+        total_count=len(accounts),
+        accounts=accounts[filters.offset:filters.offset + filters.limit],
+    )
+
+def page_from_rows(accounts: List[Account], total: Decimal, total_count: int) -> AccountResponseWithTotal:
+    return AccountResponseWithTotal(
+        total=total,
+        total_count=total_count,
+        accounts=[AccountResponseDTO.model_validate(account) for account in accounts]
+    )
+
+def account_from_cache(cached: Dict[int, AccountResponseDTO], account_id: int) -> AccountResponseDTO:
+    if account_id not in cached:
+        raise AccountNotFound
+    return cached[account_id]
+
+def account_response(account: Optional[Account], user_id: int) -> AccountResponseDTO:
+    if not account:
+        raise AccountNotFound
+    if account.user_id != user_id:
+        raise AccountNotFound
+    return AccountResponseDTO.model_validate(account)
+
+
 class AccountService:
     def __init__(self, session: Session, account_repo: AccountRepository):
         self.session = session
@@ -13,36 +52,28 @@ class AccountService:
         try:
             account_dict = data.model_dump()
             account_dict["user_id"] = user_id
-            account = self.account_repo.create(account_dict)
+            # relê a linha para o saldo vir normalizado pelo Numeric(10, 2)
+            account = self.account_repo.create(account_dict, refresh=True)
+            response = AccountResponseDTO.model_validate(account)
+            account_cache.invalidate_on_commit(self.session, user_id)
             self.session.commit()
-            self.session.refresh(account)
-            return AccountResponseDTO.model_validate(account)
+            return response
         except Exception as e:
             self.session.rollback()
             raise e
     
     def list_all(self, filters: AccountFilters, user_id: int):
-        filter_dict = filters.model_dump(exclude_none=True, exclude_unset=True)
-        offset = filter_dict.pop("offset")
-        limit = filter_dict.pop("limit")
-        accounts = self.account_repo.list_all(
-            offset=offset,
-            limit=limit,
-            filter_by={"user_id": user_id, **filter_dict},
-        )
-        total = sum([account.balance for account in accounts])
-        return AccountResponseWithTotal(
-            total=total,
-            accounts=[AccountResponseDTO.model_validate(account) for account in accounts]
-        )
+        cached = account_cache.load(self.account_repo, user_id)
+        if cached is not None:
+            return page_from_cache(cached, filters)
+        offset, limit, filter_by = page_filters(filters, user_id)
+        return page_from_rows(*self.account_repo.list_page(offset=offset, limit=limit, filter_by=filter_by))
     
     def get(self, account_id: int, user_id: int):
-        account = self.account_repo.get(account_id)
-        if not account:
-            raise AccountNotFound
-        if account.user_id != user_id:
-            raise AccountNotFound
-        return AccountResponseDTO.model_validate(account)
+        accounts = account_cache.load(self.account_repo, user_id)
+        if accounts is not None:
+            return account_from_cache(accounts, account_id)
+        return account_response(self.account_repo.get(account_id), user_id)
     
     def update(self, account_id: int, data: AccountUpdateDTO, user_id: int):
         try:
@@ -51,13 +82,16 @@ class AccountService:
                 raise AccountNotFound
             if account.user_id != user_id:
                 raise AccountNotFound
+            update_data = data.model_dump(exclude_none=True, exclude_unset=True)
             account = self.account_repo.update(
                 account_id,
-                data.model_dump(exclude_none=True, exclude_unset=True)
+                update_data,
+                refresh="balance" in update_data,
             )
+            response = AccountResponseDTO.model_validate(account)
+            account_cache.invalidate_on_commit(self.session, user_id)
             self.session.commit()
-            self.session.refresh(account)
-            return AccountResponseDTO.model_validate(account)
+            return response
         except Exception as e:
             self.session.rollback()
             raise e
@@ -70,8 +104,30 @@ class AccountService:
             if account.user_id != user_id:
                 raise AccountNotFound
             self.account_repo.delete(account_id)
+            account_cache.invalidate_on_commit(self.session, user_id)
             self.session.commit()
             return None
         except Exception as e:
             self.session.rollback()
             raise e
+
+
+class AsyncAccountService:
+    """Leituras de contas na pilha assíncrona; as escritas seguem no AccountService"""
+
+    def __init__(self, session: AsyncSession, account_repo: AsyncAccountRepository):
+        self.session = session
+        self.account_repo = account_repo
+
+    async def list_all(self, filters: AccountFilters, user_id: int):
+        cached = await account_cache.load_async(self.account_repo, user_id)
+        if cached is not None:
+            return page_from_cache(cached, filters)
+        offset, limit, filter_by = page_filters(filters, user_id)
+        return page_from_rows(*await self.account_repo.list_page(offset=offset, limit=limit, filter_by=filter_by))
+
+    async def get(self, account_id: int, user_id: int):
+        accounts = await account_cache.load_async(self.account_repo, user_id)
+        if accounts is not None:
+            return account_from_cache(accounts, account_id)
+        return account_response(await self.account_repo.get(account_id), user_id)
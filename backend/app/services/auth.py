@@ -1,12 +1,15 @@
+import asyncio
 from datetime import datetime, timedelta, UTC
 from hashlib import sha256
 from secrets import token_urlsafe
+from typing import Optional, Tuple
 from sqlalchemy.orm import Session
 from app.exceptions.auth import InvalidCredentials
 from app.repositories.session import UserSessionRepository
 from app.repositories.user import UserRepository
 from app.schemas.auth import LoginDTO, UserSessionResponseDTO
-from app.security import verify_password
+from app.config import settings
+from app.security import invalidate_session, verify_password
 
 
 class AuthService:
@@ -19,23 +22,27 @@ class AuthService:
         self.session = session
         self.user_repo = user_repo
         self.user_session_repo = user_session_repo
-        self.session_expires_seconds = 60 * 60
+        self.session_expires_seconds = settings.session_expires_seconds
 
-    def login(self, data: LoginDTO):
+    def _find_credentials(self, email: str) -> Optional[Tuple[int, str]]:
+        try:
+            user = self.user_repo.find_by_email(email)
+            return (user.id, user.password_hash) if user else None
+        finally:
+            # devolve a conexão ao pool antes de esperar pelo Argon2
+            self.session.rollback()
+
+    def _create_session(self, user_id: int) -> UserSessionResponseDTO:
         try:
-            user = self.user_repo.find_by_email(data.email)
-            if not user or not verify_password(data.password, user.password_hash):
-                raise InvalidCredentials
             session_id = token_urlsafe(32)
             session_id_hash = sha256(session_id.encode()).hexdigest()
             session_expires_at = datetime.now(UTC) + timedelta(seconds=self.session_expires_seconds)
-            user_session = self.user_session_repo.create({
+            self.user_session_repo.create({
                 "token": session_id_hash,
-                "user_id": user.id,
+                "user_id": user_id,
                 "expires_at": session_expires_at.replace(tzinfo=None)
             })
             self.session.commit()
-            self.session.refresh(user_session)
             return UserSessionResponseDTO(
                 session_id=session_id,
                 expires_at=session_expires_at,
@@ -44,18 +51,31 @@ class AuthService:
             self.session.rollback()
             raise e
 
+    async def login(self, data: LoginDTO):
+        """O acesso ao banco roda em threads; a verificação da senha só aguarda o pool de hash"""
+        credentials = await asyncio.to_thread(self._find_credentials, data.email)
+        if not credentials:
+            raise InvalidCredentials
+        user_id, password_hash = credentials
+        if not await verify_password(data.password, password_hash):
+            raise InvalidCredentials
+        return await asyncio.to_thread(self._create_session, user_id)
+
     def logout(self, session_id: str):
         try:
             session_id_hash = sha256(session_id.encode()).hexdigest()
+            invalidate_session(session_id_hash)
             session = self.user_session_repo.find_by_token(session_id_hash)
             if not session or session.revoked == 1:
                 return None
-            updated_user_session = self.user_session_repo.update(session.id, {
+            self.user_session_repo.update(session.id, {
                 "revoked": 1,
                 "revoked_at": datetime.now(UTC).replace(tzinfo=None)
             })
             self.session.commit()
-            self.session.refresh(updated_user_session)
+            # de novo após o commit, caso uma requisição concorrente tenha
+            # recolocado a sessão no cache antes da revogação
+            invalidate_session(session_id_hash)
             return session_id
         except Exception as e:
             self.session.rollback()
@@ -1,9 +1,39 @@
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.exceptions.category import CategoryNotFound
-from app.repositories.category import CategoryRepository
+from app.models.category import Category
+from app.reference_cache import category_cache
+from app.repositories.category import AsyncCategoryRepository, CategoryRepository
 from app.schemas.category import CategoryCreateDTO, CategoryFilters, CategoryResponseDTO, CategoryUpdateDTO
 
 
+def list_filters(filters: CategoryFilters, user_id: int) -> Tuple[int, int, Dict[str, Any]]:
+    filter_dict = filters.model_dump(exclude_none=True, exclude_unset=True)
+    offset = filter_dict.pop("offset")
+    limit = filter_dict.pop("limit")
+    return offset, limit, {"user_id": user_id, **filter_dict}
+
+def list_from_cache(cached: Dict[int, CategoryResponseDTO], filters: CategoryFilters) -> List[CategoryResponseDTO]:
+    matching = [
+        category for category in cached.values()
+        if filters.category_type is None or category.category_type == filters.category_type
+    ]
+    return matching[filters.offset:filters.offset + filters.limit]
+
+def category_from_cache(cached: Dict[int, CategoryResponseDTO], category_id: int) -> CategoryResponseDTO:
+    if category_id not in cached:
+        raise CategoryNotFound
+    return cached[category_id]
+
+def category_response(category: Optional[Category], user_id: int) -> CategoryResponseDTO:
+    if not category:
+        raise CategoryNotFound
+    if category.user_id != user_id:
+        raise CategoryNotFound
+    return CategoryResponseDTO.model_validate(category)
+
+
 class CategoryService:
     def __init__(self, session: Session, category_repo: CategoryRepository):
         self.session = session
@@ -14,31 +44,27 @@ class CategoryService:
             category_dict = data.model_dump()
             category_dict["user_id"] = user_id
             category = self.category_repo.create(category_dict)
+            response = CategoryResponseDTO.model_validate(category)
+            category_cache.invalidate_on_commit(self.session, user_id)
             self.session.commit()
-            self.session.refresh(category)
-            return CategoryResponseDTO.model_validate(category)
+            return response
         except Exception as e:
             self.session.rollback()
             raise e
     
     def list_all(self, filters: CategoryFilters, user_id: int):
-        filter_dict = filters.model_dump(exclude_none=True, exclude_unset=True)
-        offset = filter_dict.pop("offset")
-        limit = filter_dict.pop("limit")
-        categories = self.category_repo.list_all(
-            offset=offset,
-            limit=limit,
-            filter_by={"user_id": user_id, **filter_dict},
-        )
+        categories = category_cache.load(self.category_repo, user_id)
+        if categories is not None:
+            return list_from_cache(categories, filters)
+        offset, limit, filter_by = list_filters(filters, user_id)
+        categories = self.category_repo.list_all(offset=offset, limit=limit, filter_by=filter_by)
         return [CategoryResponseDTO.model_validate(category) for category in categories]
     
     def get(self, category_id: int, user_id: int):
-        category = self.category_repo.get(category_id)
-        if not category:
-            raise CategoryNotFound
-        if category.user_id != user_id:
-            raise CategoryNotFound
-        return CategoryResponseDTO.model_validate(category)
+        categories = category_cache.load(self.category_repo, user_id)
+        if categories is not None:
+            return category_from_cache(categories, category_id)
+        return category_response(self.category_repo.get(category_id), user_id)
     
     def update(self, category_id: int, data: CategoryUpdateDTO, user_id: int):
         try:
@@ -51,9 +77,10 @@ class CategoryService:
                 category_id,
                 data.model_dump(exclude_none=True, exclude_unset=True)
             )
+            response = CategoryResponseDTO.model_validate(category)
+            category_cache.invalidate_on_commit(self.session, user_id)
             self.session.commit()
-            self.session.refresh(category)
-            return CategoryResponseDTO.model_validate(category)
+            return response
         except Exception as e:
             self.session.rollback()
             raise e
@@ -66,8 +93,31 @@ class CategoryService:
             if category.user_id != user_id:
                 raise CategoryNotFound
             self.category_repo.delete(category_id)
+            category_cache.invalidate_on_commit(self.session, user_id)
             self.session.commit()
             return None
         except Exception as e:
             self.session.rollback()
             raise e
+
+
+class AsyncCategoryService:
+    """Leituras de categorias na pilha assíncrona; as escritas seguem no CategoryService"""
+
+    def __init__(self, session: AsyncSession, category_repo: AsyncCategoryRepository):
+        self.session = session
+        self.category_repo = category_repo
+
+    async def list_all(self, filters: CategoryFilters, user_id: int):
+        categories = await category_cache.load_async(self.category_repo, user_id)
+        if categories is not None:
+            return list_from_cache(categories, filters)
+        offset, limit, filter_by = list_filters(filters, user_id)
+        categories = await self.category_repo.list_all(offset=offset, limit=limit, filter_by=filter_by)
+        return [CategoryResponseDTO.model_validate(category) for category in categories]
+
+    async def get(self, category_id: int, user_id: int):
+        categories = await category_cache.load_async(self.category_repo, user_id)
+        if categories is not None:
+            return category_from_cache(categories, category_id)
+        return category_response(await self.category_repo.get(category_id), user_id)
@@ -1,12 +1,173 @@
+import base64
+import binascii
+import csv
+import datetime
+import io
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.exceptions.transaction import TransactionNotFound
+from app.exceptions.transaction import (
+    CategoryTypeMismatch,
+    InvalidCursor,
+    TransactionNotFound,
+    UnsupportedImportFormat,
+)
 from app.exceptions.category import CategoryNotFound
 from app.exceptions.account import AccountNotFound
+from app.exceptions.base import AppBaseException
+from app.importers import ImportRow, iter_csv_rows, iter_ofx_rows
 from app.models.category import CategoryType
-from app.repositories.account import AccountRepository
+from app.reference_cache import account_cache, category_cache
+from app.repositories.account import AccountRepository, BalanceDeltas, add_balance_delta
 from app.repositories.category import CategoryRepository
-from app.repositories.transaction import TransactionRepository
-from app.schemas.transaction import TransactionCreateDTO, TransactionFilters, TransactionResponseDTO, TransactionResponsePagination, TransactionSummaryDTO, TransactionSummaryWithTotal, TransactionUpdateDTO
+from app.repositories.rollup import (
+    AsyncTransactionRollupRepository,
+    RollupDeltas,
+    TransactionRollupRepository,
+    add_delta,
+    rollup_key,
+)
+from app.repositories.transaction import AsyncTransactionRepository, TransactionRepository
+from app.models.transaction import Transaction
+from app.schemas.transaction import (
+    ExportFormat,
+    ImportFormat,
+    OrderByOptions,
+    TransactionBatchOperation,
+    TransactionBatchOperationResult,
+    TransactionBatchResult,
+    TransactionCreateDTO,
+    TransactionFilterFields,
+    TransactionFilters,
+    TransactionImportError,
+    TransactionImportResult,
+    TransactionResponseDTO,
+    TransactionResponsePagination,
+    TransactionSummaryDTO,
+    TransactionSummaryWithTotal,
+    TransactionUpdateDTO,
+)
+
+
+IMPORT_BATCH_SIZE = 500
+MAX_IMPORT_ERRORS = 1000
+EXPORT_BATCH_SIZE = 1000
+# campos de uma transação que as operações em lote podem compor em memória
+BATCH_FIELDS = ("amount", "category_id", "category_type", "account_id", "date", "comment")
+EXPORT_COLUMNS = (
+    "id", "date", "amount", "category_type", "category_id",
+    "category_name", "account_id", "account_name", "comment",
+)
+
+
+def encode_cursor(order_by: OrderByOptions, transaction: Transaction) -> str:
+    """Codifica a chave de ordenação (valor, id) da última linha de uma página"""
+    field_name, _ = order_by.value.split(":")
+    value = getattr(transaction, field_name)
+    payload = {"o": order_by.value, "v": str(value), "id": transaction.id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: OrderByOptions) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["o"] != order_by.value:
+            raise InvalidCursor
+        field_name, _ = order_by.value.split(":")
+        if field_name == "date":
+            value = datetime.date.fromisoformat(payload["v"])
+        else:
+            value = Decimal(payload["v"])
+        return value, int(payload["id"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError, InvalidOperation):
+        raise InvalidCursor
+
+
+def format_validation_error(error: ValidationError) -> str:
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    return f"{field}: {first['msg']}" if field else first["msg"]
+
+
+def signed_amount(category_type: CategoryType, amount: Decimal) -> Decimal:
+    """Efeito do lançamento no saldo da conta: despesas subtraem, receitas somam"""
+    return -amount if category_type == CategoryType.EXPENSES else amount
+
+
+def build_query_filters(filters: TransactionFilterFields, user_id: int) -> Dict[str, Any]:
+    query_filters = {"user_id": user_id}
+    if filters.category_type is not None:
+        query_filters["category_type"] = filters.category_type
+    if filters.account_id is not None:
+        query_filters["account_id"] = filters.account_id
+    if filters.category_id:
+        query_filters["category_id"] = filters.category_id
+    if filters.date:
+        query_filters["date"] = filters.date
+    if filters.start_date:
+        query_filters["start_date"] = filters.start_date
+    if filters.end_date:
+        query_filters["end_date"] = filters.end_date
+    if filters.month:
+        query_filters["month"] = filters.month
+    if filters.year:
+        query_filters["year"] = filters.year
+    return query_filters
+
+
+def build_summary(raw_data) -> TransactionSummaryWithTotal:
+    grand_total = sum(row[1] for row in raw_data) if raw_data else 0
+    summary_list = []
+    for category, total in raw_data:
+        percent = (total / grand_total * 100) if grand_total != 0 else 0
+        dto = TransactionSummaryDTO(
+            category_id=category.id,
+            category_name=category.name,
+            category_type=category.category_type,
+            category_color=category.color,
+            total_amount=total,
+            percentage=round(percent, 2)
+        )
+        summary_list.append(dto)
+    return TransactionSummaryWithTotal(
+        total=grand_total,
+        summary=summary_list,
+    )
+
+
+def page_options(filters: TransactionFilters) -> Tuple[OrderByOptions, Dict[str, str], Optional[Tuple[Any, int]], int]:
+    """Retorna a ordenação, a chave do cursor e o offset da página pedida"""
+    order_by = filters.order_by or OrderByOptions.date_desc
+    field_name, direction = order_by.value.split(":")
+    # com cursor, a paginação continua a partir da chave da última linha
+    # e o offset é ignorado
+    after = decode_cursor(filters.cursor, order_by) if filters.cursor else None
+    offset = 0 if after else filters.offset
+    return order_by, {field_name: direction}, after, offset
+
+
+def build_page(
+    filters: TransactionFilters,
+    order_by: OrderByOptions,
+    offset: int,
+    transactions: List[Transaction],
+    total: Optional[int],
+) -> TransactionResponsePagination:
+    """Monta a página a partir de até limit + 1 linhas; a linha extra indica que há mais"""
+    has_more = len(transactions) > filters.limit
+    transactions = transactions[:filters.limit]
+    return TransactionResponsePagination(
+        data=[TransactionResponseDTO.model_validate(t) for t in transactions],
+        total=total,
+        limit=filters.limit,
+        offset=offset,
+        next_cursor=encode_cursor(order_by, transactions[-1]) if has_more else None,
+    )
 
 
 class TransactionService:
@@ -16,98 +177,124 @@ class TransactionService:
         transaction_repo: TransactionRepository,
         category_repo: CategoryRepository,
         account_repo: AccountRepository,
+        rollup_repo: TransactionRollupRepository,
     ):
         self.session = session
         self.transaction_repo = transaction_repo
         self.category_repo = category_repo
         self.account_repo = account_repo
+        self.rollup_repo = rollup_repo
+
+    def _category_types(self, category_ids: Iterable[int], user_id: int) -> Dict[int, CategoryType]:
+        """Tipo de cada categoria do usuário entre as informadas; as demais ficam de fora"""
+        category_ids = list(category_ids)
+        categories = category_cache.load(self.category_repo, user_id)
+        if categories is not None:
+            return {id: categories[id].category_type for id in category_ids if id in categories}
+        return {
+            category.id: category.category_type for category in self.category_repo.list_all(
+                limit=len(category_ids),
+                filter_by={"user_id": user_id, "id": category_ids},
+            )
+        }
+
+    def _owned_accounts(self, account_ids: Iterable[int], user_id: int) -> Set[int]:
+        account_ids = list(account_ids)
+        accounts = account_cache.load(self.account_repo, user_id)
+        if accounts is not None:
+            return {id for id in account_ids if id in accounts}
+        return {
+            account.id for account in self.account_repo.list_all(
+                limit=len(account_ids),
+                filter_by={"user_id": user_id, "id": account_ids},
+            )
+        }
 
     def create(self, data: TransactionCreateDTO, user_id: int):
         try:
-            category = self.category_repo.get(data.category_id)
-            if not category or category.user_id != user_id:
+            category_type = self._category_types([data.category_id], user_id).get(data.category_id)
+            if category_type is None:
                 raise CategoryNotFound
-            account = self.account_repo.get(data.account_id)
-            if not account or account.user_id != user_id:
+            # o UPDATE atômico do saldo também confirma que a conta é do usuário
+            if not self.account_repo.apply_balance_delta(
+                data.account_id, user_id, signed_amount(category_type, data.amount)
+            ):
                 raise AccountNotFound
             transaction_dict = data.model_dump(exclude_none=True, exclude_unset=True)
             transaction_dict["user_id"] = user_id
-            transaction_dict["category_type"] = category.category_type
+            transaction_dict["category_type"] = category_type
             created_transaction = self.transaction_repo.create(transaction_dict)
-            if category.category_type == CategoryType.EXPENSES:
-                new_balance = account.balance - data.amount
-            else:
-                new_balance = account.balance + data.amount
-            self.account_repo.update(account.id, {
-                "balance": new_balance
-            })
+            self.rollup_repo.apply_deltas({rollup_key(created_transaction): (created_transaction.amount, 1)})
+            # uma leitura com categoria e conta antes do commit monta a resposta;
+            # depois dele os objetos expiram e cada acesso custaria um SELECT
+            created_transaction = self.transaction_repo.get(created_transaction.id, populate_existing=True)
+            response = TransactionResponseDTO.model_validate(created_transaction)
             self.session.commit()
-            self.session.refresh(created_transaction)
-            return TransactionResponseDTO.model_validate(created_transaction)
+            return response
         except Exception as e:
             self.session.rollback()
             raise e
     
     def list_all(self, filters: TransactionFilters, user_id: int):
-        query_filters = {"user_id": user_id}
-        if filters.category_type is not None:
-            query_filters["category_type"] = filters.category_type
-        if filters.account_id is not None:
-            query_filters["account_id"] = filters.account_id
-        if filters.category_id:
-            query_filters["category_id"] = filters.category_id
-        if filters.date:
-            query_filters["date"] = filters.date
-        if filters.start_date:
-            query_filters["start_date"] = filters.start_date
-        if filters.end_date:
-            query_filters["end_date"] = filters.end_date
-        if filters.month:
-            query_filters["month"] = filters.month
-        if filters.year:
-            query_filters["year"] = filters.year
+        query_filters = build_query_filters(filters, user_id)
         if filters.summary:
-            raw_data = self.transaction_repo.get_summary(filter_by=query_filters)
-            grand_total = sum(row[1] for row in raw_data) if raw_data else 0
-            summary_list = []
-            for category, total in raw_data:
-                percent = (total / grand_total * 100) if grand_total != 0 else 0
-                dto = TransactionSummaryDTO(
-                    category_id=category.id,
-                    category_name=category.name,
-                    category_type=category.category_type,
-                    category_color=category.color,
-                    total_amount=total,
-                    percentage=round(percent, 2)
-                )
-                summary_list.append(dto)
-            return TransactionSummaryWithTotal(
-                total=grand_total,
-                summary=summary_list,
-            )
-        query_order = {}
-        if filters.order_by:
-            field_name, direction = filters.order_by.value.split(":")
-            query_order[field_name] = direction
-        else:
-            query_order = {"date": "desc"}
-        transactions = self.transaction_repo.list_all(
-            offset=filters.offset,
-            limit=filters.limit,
+            if self.rollup_repo.covers(query_filters):
+                raw_data = self.rollup_repo.get_summary(filter_by=query_filters)
+            else:
+                raw_data = self.transaction_repo.get_summary(filter_by=query_filters)
+            return build_summary(raw_data)
+        order_by, query_order, after, offset = page_options(filters)
+        transactions, total = self.transaction_repo.list_page(
+            offset=offset,
+            limit=filters.limit + 1,
             filter_by=query_filters,
-            order_by=query_order
-        )
-        # return [TransactionResponseDTO.model_validate(t) for t in transactions]
-        total = self.transaction_repo.count_rows(query_filters)
-        if total is None:
-            total = 0
-        return TransactionResponsePagination(
-            data=[TransactionResponseDTO.model_validate(t) for t in transactions],
-            total=total,
-            limit=filters.limit,
-            offset=filters.offset,
+            order_by=query_order,
+            after=after,
+            with_total=filters.include_total,
         )
+        return build_page(filters, order_by, offset, transactions, total)
     
+    def export(self, filters: TransactionFilterFields, user_id: int, export_format: ExportFormat) -> Iterator[str]:
+        """Gera o arquivo exportado em blocos, lendo as transações em lotes"""
+        order_by = filters.order_by or OrderByOptions.date_desc
+        field_name, direction = order_by.value.split(":")
+        rows = self.transaction_repo.stream_rows(
+            filter_by=build_query_filters(filters, user_id),
+            order_by={field_name: direction},
+            batch_size=EXPORT_BATCH_SIZE,
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == ExportFormat.csv else None
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)
+        for count, row in enumerate(rows, start=1):
+            if writer:
+                writer.writerow([
+                    row.id, row.date.isoformat(), row.amount, row.category_type.value,
+                    row.category_id, row.category_name, row.account_id,
+                    row.account_name, row.comment,
+                ])
+            else:
+                record = {
+                    "id": row.id,
+                    "date": row.date.isoformat(),
+                    "amount": str(row.amount),
+                    "category_type": row.category_type.value,
+                    "category_id": row.category_id,
+                    "category_name": row.category_name,
+                    "account_id": row.account_id,
+                    "account_name": row.account_name,
+                    "comment": row.comment,
+                }
+                buffer.write(json.dumps(record, ensure_ascii=False))
+                buffer.write("\n")
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
     def get(self, transaction_id: int, user_id: int):
         transaction = self.transaction_repo.get(transaction_id)
         if not transaction:
@@ -121,28 +308,32 @@ class TransactionService:
             original_transaction = self.transaction_repo.get(transaction_id)
             if not original_transaction or original_transaction.user_id != user_id:
                 raise TransactionNotFound
+            rollup_deltas: RollupDeltas = {}
+            add_delta(rollup_deltas, rollup_key(original_transaction), -original_transaction.amount, -1)
             new_category_type = original_transaction.category_type
             if data.category_id is not None:
-                category = self.category_repo.get(data.category_id)
-                if not category or category.user_id != user_id:
+                new_category_type = self._category_types([data.category_id], user_id).get(data.category_id)
+                if new_category_type is None:
                     raise CategoryNotFound
-                new_category_type = category.category_type
             new_account_id = data.account_id if data.account_id is not None else original_transaction.account_id
-            if data.account_id is not None:
-                new_account = self.account_repo.get(new_account_id)
-                if not new_account or new_account.user_id != user_id:
-                    raise AccountNotFound
+            new_amount = data.amount if data.amount is not None else original_transaction.amount
             has_financial_changes = (
                 (data.amount is not None and data.amount != original_transaction.amount) or
                 (data.category_id is not None and data.category_id != original_transaction.category_id) or
                 (data.account_id is not None and data.account_id != original_transaction.account_id)
             )
             if has_financial_changes:
-                old_account = self.account_repo.get(original_transaction.account_id)
-                revert_value = original_transaction.amount if original_transaction.category_type == CategoryType.EXPENSES else -original_transaction.amount
-                self.account_repo.update(old_account.id, {
-                    "balance": old_account.balance + revert_value
-                })
+                # estorna o lançamento antigo e aplica o novo; na mesma conta os
+                # dois se somam num único UPDATE
+                balance_deltas: BalanceDeltas = {}
+                add_balance_delta(
+                    balance_deltas,
+                    original_transaction.account_id,
+                    -signed_amount(original_transaction.category_type, original_transaction.amount),
+                )
+                add_balance_delta(balance_deltas, new_account_id, signed_amount(new_category_type, new_amount))
+                if not self.account_repo.apply_balance_deltas(balance_deltas, user_id):
+                    raise AccountNotFound
             update_data = data.model_dump(exclude_none=True, exclude_unset=True)
             if data.category_id is not None:
                 update_data["category_type"] = new_category_type
@@ -150,15 +341,12 @@ class TransactionService:
                 transaction_id,
                 update_data
             )
-            if has_financial_changes:
-                target_account = self.account_repo.get(updated_transaction.account_id)
-                apply_value = -updated_transaction.amount if new_category_type == CategoryType.EXPENSES else updated_transaction.amount
-                self.account_repo.update(target_account.id, {
-                    "balance": target_account.balance + apply_value
-                })
+            add_delta(rollup_deltas, rollup_key(updated_transaction), updated_transaction.amount, 1)
+            self.rollup_repo.apply_deltas(rollup_deltas)
+            updated_transaction = self.transaction_repo.get(transaction_id, populate_existing=True)
+            response = TransactionResponseDTO.model_validate(updated_transaction)
             self.session.commit()
-            self.session.refresh(updated_transaction)
-            return TransactionResponseDTO.model_validate(updated_transaction)
+            return response
         except Exception as e:
             self.session.rollback()
             raise e
@@ -170,20 +358,280 @@ class TransactionService:
                 raise TransactionNotFound
             if transaction.user_id != user_id:
                 raise TransactionNotFound
-            account = self.account_repo.get(transaction.account_id)
-            if account:
-                if account.user_id == user_id:
-                    if transaction.category_type == CategoryType.EXPENSES:
-                        new_balance = account.balance + transaction.amount
-                    else:
-                        new_balance = account.balance - transaction.amount
-                    
-                    self.account_repo.update(account.id, {
-                        "balance": new_balance
-                    })
+            self.account_repo.apply_balance_delta(
+                transaction.account_id, user_id, -signed_amount(transaction.category_type, transaction.amount)
+            )
+            self.rollup_repo.apply_deltas({rollup_key(transaction): (-transaction.amount, -1)})
             self.transaction_repo.delete(transaction_id)
             self.session.commit()
             return None
         except Exception as e:
             self.session.rollback()
-            raise e
\ No newline at end of file
+            raise e
+
+    def batch(self, operations: List[TransactionBatchOperation], user_id: int) -> TransactionBatchResult:
+        """Aplica criações, alterações e remoções numa única transação.
+
+        Operações inválidas são relatadas e ignoradas. Operações sobre o mesmo id
+        são compostas em memória, as escritas saem em lote e cada conta recebe
+        um único ajuste de saldo com a soma de todas as operações.
+        """
+        try:
+            target_ids = list({op.id for op in operations if op.op != "create"})
+            state: Dict[int, Dict[str, Any]] = {}
+            if target_ids:
+                for transaction in self.transaction_repo.list_all(
+                    limit=len(target_ids),
+                    filter_by={"user_id": user_id, "id": target_ids},
+                ):
+                    state[transaction.id] = {field: getattr(transaction, field) for field in BATCH_FIELDS}
+            category_ids = {
+                op.data.category_id for op in operations
+                if op.op != "delete" and op.data.category_id is not None
+            }
+            category_types = self._category_types(category_ids, user_id) if category_ids else {}
+            account_ids = {
+                op.data.account_id for op in operations
+                if op.op != "delete" and op.data.account_id is not None
+            }
+            owned_accounts = self._owned_accounts(account_ids, user_id) if account_ids else set()
+            balance_deltas: BalanceDeltas = {}
+            rollup_deltas: RollupDeltas = {}
+
+            def apply(values: Dict[str, Any], sign: int):
+                add_balance_delta(
+                    balance_deltas,
+                    values["account_id"],
+                    sign * signed_amount(values["category_type"], values["amount"]),
+                )
+                key = (user_id, values["account_id"], values["category_id"], values["date"].year, values["date"].month)
+                add_delta(rollup_deltas, key, sign * values["amount"], sign)
+
+            new_rows: List[Dict[str, Any]] = []
+            created_results: List[TransactionBatchOperationResult] = []
+            updates: Dict[int, Dict[str, Any]] = {}
+            deleted: List[int] = []
+            results: List[TransactionBatchOperationResult] = []
+            for index, operation in enumerate(operations):
+                target_id = None if operation.op == "create" else operation.id
+                try:
+                    if operation.op == "create":
+                        data = operation.data
+                        if data.category_id not in category_types:
+                            raise CategoryNotFound
+                        if data.account_id not in owned_accounts:
+                            raise AccountNotFound
+                        values = {
+                            **data.model_dump(),
+                            "user_id": user_id,
+                            "category_type": category_types[data.category_id],
+                        }
+                        apply(values, 1)
+                        new_rows.append(values)
+                    elif operation.op == "update":
+                        current = state.get(operation.id)
+                        if current is None:
+                            raise TransactionNotFound
+                        changes = operation.data.model_dump(exclude_none=True, exclude_unset=True)
+                        if "category_id" in changes:
+                            if changes["category_id"] not in category_types:
+                                raise CategoryNotFound
+                            changes["category_type"] = category_types[changes["category_id"]]
+                        if "account_id" in changes and changes["account_id"] not in owned_accounts:
+                            raise AccountNotFound
+                        # sem campos a alterar a operação vale como aplicada, sem escrita
+                        if changes:
+                            apply(current, -1)
+                            current.update(changes)
+                            apply(current, 1)
+                            updates.setdefault(operation.id, {}).update(changes)
+                    else:
+                        current = state.pop(operation.id, None)
+                        if current is None:
+                            raise TransactionNotFound
+                        apply(current, -1)
+                        updates.pop(operation.id, None)
+                        deleted.append(operation.id)
+                except AppBaseException as e:
+                    results.append(TransactionBatchOperationResult(
+                        index=index,
+                        op=operation.op,
+                        id=target_id,
+                        success=False,
+                        error=e.error_code,
+                        message=e.message,
+                    ))
+                    continue
+                result = TransactionBatchOperationResult(index=index, op=operation.op, id=target_id, success=True)
+                if operation.op == "create":
+                    created_results.append(result)
+                results.append(result)
+            self.transaction_repo.bulk_delete(deleted, owner_id=user_id)
+            self.transaction_repo.bulk_update(updates, owner_id=user_id)
+            for result, created in zip(created_results, self.transaction_repo.create_many(new_rows)):
+                result.id = created.id
+            # contas já verificadas acima: ajustes nulos não precisam ir ao banco
+            self.account_repo.apply_balance_deltas(
+                {account_id: delta for account_id, delta in balance_deltas.items() if delta},
+                user_id,
+            )
+            self.rollup_repo.apply_deltas(rollup_deltas)
+            self.session.commit()
+            applied = sum(1 for result in results if result.success)
+            return TransactionBatchResult(applied=applied, failed=len(results) - applied, results=results)
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+    def import_file(
+        self,
+        file: BinaryIO,
+        filename: Optional[str],
+        file_format: Optional[ImportFormat],
+        user_id: int,
+        default_account_id: Optional[int] = None,
+        default_category_id: Optional[int] = None,
+        income_category_id: Optional[int] = None,
+        expense_category_id: Optional[int] = None,
+    ):
+        if file_format is None:
+            extension = (filename or "").rsplit(".", 1)[-1].lower()
+            if extension == "csv":
+                file_format = ImportFormat.csv
+            elif extension in ("ofx", "qfx"):
+                file_format = ImportFormat.ofx
+            else:
+                raise UnsupportedImportFormat
+        rows = iter_csv_rows(file) if file_format == ImportFormat.csv else iter_ofx_rows(file)
+        return self.import_rows(
+            rows,
+            user_id,
+            default_account_id,
+            default_category_id,
+            income_category_id,
+            expense_category_id,
+        )
+
+    def import_rows(
+        self,
+        rows: Iterable[ImportRow],
+        user_id: int,
+        default_account_id: Optional[int] = None,
+        default_category_id: Optional[int] = None,
+        income_category_id: Optional[int] = None,
+        expense_category_id: Optional[int] = None,
+    ):
+        """Importa as linhas em lotes numa única transação.
+
+        Linhas inválidas são relatadas e ignoradas; a posse de cada categoria e
+        conta é verificada uma única vez e o saldo de cada conta recebe um
+        único ajuste com a soma dos lançamentos importados.
+
+        Linhas que já dizem o tipo (category_type, no OFX) usam a categoria
+        padrão desse tipo e são recusadas se a categoria for do outro tipo.
+        """
+        try:
+            category_types: Dict[int, Optional[CategoryType]] = {}
+            owned_accounts: Dict[int, bool] = {}
+            balance_deltas: BalanceDeltas = {}
+            rollup_deltas: RollupDeltas = {}
+            batch: List[Dict[str, Any]] = []
+            errors: List[TransactionImportError] = []
+            imported = 0
+            failed = 0
+            default_categories = {
+                CategoryType.INCOME.value: income_category_id or default_category_id,
+                CategoryType.EXPENSES.value: expense_category_id or default_category_id,
+            }
+            for row_number, raw in rows:
+                row_type = raw.pop("category_type", None)
+                values = {
+                    "category_id": default_categories.get(row_type, default_category_id),
+                    "account_id": default_account_id,
+                    **{key: value for key, value in raw.items() if value is not None},
+                }
+                error = None
+                try:
+                    data = TransactionCreateDTO.model_validate(values)
+                except ValidationError as e:
+                    error = format_validation_error(e)
+                if error is None:
+                    if data.category_id not in category_types:
+                        category_types[data.category_id] = self._category_types(
+                            [data.category_id], user_id
+                        ).get(data.category_id)
+                    if data.account_id not in owned_accounts:
+                        owned_accounts[data.account_id] = bool(self._owned_accounts([data.account_id], user_id))
+                    category_type = category_types[data.category_id]
+                    if category_type is None:
+                        error = CategoryNotFound().message
+                    elif row_type is not None and category_type.value != row_type:
+                        error = CategoryTypeMismatch().message
+                    elif not owned_accounts[data.account_id]:
+                        error = AccountNotFound().message
+                if error is not None:
+                    failed += 1
+                    if len(errors) < MAX_IMPORT_ERRORS:
+                        errors.append(TransactionImportError(row=row_number, message=error))
+                    continue
+                batch.append({
+                    **data.model_dump(),
+                    "user_id": user_id,
+                    "category_type": category_type,
+                })
+                add_balance_delta(balance_deltas, data.account_id, signed_amount(category_type, data.amount))
+                key = (user_id, data.account_id, data.category_id, data.date.year, data.date.month)
+                add_delta(rollup_deltas, key, data.amount, 1)
+                imported += 1
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    self.transaction_repo.bulk_create(batch)
+                    batch = []
+            self.transaction_repo.bulk_create(batch)
+            self.account_repo.apply_balance_deltas(balance_deltas, user_id)
+            self.rollup_repo.apply_deltas(rollup_deltas)
+            self.session.commit()
+            return TransactionImportResult(imported=imported, failed=failed, errors=errors)
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+
+class AsyncTransactionService:
+    """Leituras de transações na pilha assíncrona; as escritas seguem no TransactionService"""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        transaction_repo: AsyncTransactionRepository,
+        rollup_repo: AsyncTransactionRollupRepository,
+    ):
+        self.session = session
+        self.transaction_repo = transaction_repo
+        self.rollup_repo = rollup_repo
+
+    async def list_all(self, filters: TransactionFilters, user_id: int):
+        query_filters = build_query_filters(filters, user_id)
+        if filters.summary:
+            if self.rollup_repo.covers(query_filters):
+                raw_data = await self.rollup_repo.get_summary(filter_by=query_filters)
+            else:
+                raw_data = await self.transaction_repo.get_summary(filter_by=query_filters)
+            return build_summary(raw_data)
+        order_by, query_order, after, offset = page_options(filters)
+        transactions, total = await self.transaction_repo.list_page(
+            offset=offset,
+            limit=filters.limit + 1,
+            filter_by=query_filters,
+            order_by=query_order,
+            after=after,
+            with_total=filters.include_total,
+        )
+        return build_page(filters, order_by, offset, transactions, total)
+
+    async def get(self, transaction_id: int, user_id: int):
+        transaction = await self.transaction_repo.get(transaction_id)
+        if not transaction:
+            raise TransactionNotFound
+        if transaction.user_id != user_id:
+            raise TransactionNotFound
+        return TransactionResponseDTO.model_validate(transaction)
@@ -1,8 +1,10 @@
+import asyncio
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.exceptions.user import UserAlreadyExists, UserNotFound
 from app.repositories.user import UserRepository
 from app.schemas.user import UserCreateDTO
-from app.security import get_password_hash
+from app.security import get_password_hash, invalidate_user_sessions
 
 
 class UserService:
@@ -10,21 +12,35 @@ class UserService:
         self.session = session
         self.user_repo = user_repo
     
-    def create(self, data: UserCreateDTO):
+    def _email_taken(self, email: str) -> bool:
+        try:
+            return self.user_repo.find_by_email(email) is not None
+        finally:
+            # devolve a conexão ao pool antes de esperar pelo Argon2
+            self.session.rollback()
+
+    def _insert(self, user_data: dict):
         try:
-            user_exists = self.user_repo.find_by_email(data.email)
-            if user_exists:
-                raise UserAlreadyExists
-            user_data = data.model_dump()
-            password = user_data.pop("password")
-            user_data["password_hash"] = get_password_hash(password)
             self.user_repo.create(user_data)
             self.session.commit()
-            return None
+        except IntegrityError:
+            # outro cadastro com o mesmo e-mail terminou enquanto o hash era calculado
+            self.session.rollback()
+            raise UserAlreadyExists
         except Exception as e:
             self.session.rollback()
             raise e
 
+    async def create(self, data: UserCreateDTO):
+        """O acesso ao banco roda em threads; o hash da senha só aguarda o pool de hash"""
+        if await asyncio.to_thread(self._email_taken, data.email):
+            raise UserAlreadyExists
+        user_data = data.model_dump()
+        password = user_data.pop("password")
+        user_data["password_hash"] = await get_password_hash(password)
+        await asyncio.to_thread(self._insert, user_data)
+        return None
+
     def delete(self, user_id: int, current_user_id: int):
         try:
             if user_id != current_user_id:
@@ -32,6 +48,7 @@ class UserService:
             if not self.user_repo.delete(user_id):
                 raise UserNotFound
             self.session.commit()
+            invalidate_user_sessions(user_id)
             return None
         except Exception as e:
             self.session.rollback()
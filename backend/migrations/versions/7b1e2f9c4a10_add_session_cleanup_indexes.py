@@ -0,0 +1,37 @@
+"""add session cleanup indexes
+
+Revision ID: 7b1e2f9c4a10
+Revises: d56d641b7305
+Create Date: 2026-10-18 18:02:11.514220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1e2f9c4a10'
+down_revision: Union[str, Sequence[str], None] = 'd56d641b7305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_sessions_expires_at', 'sessions', ['expires_at'], unique=False)
+    op.create_index(
+        'ix_sessions_revoked',
+        'sessions',
+        ['revoked'],
+        unique=False,
+        sqlite_where=sa.text('revoked = 1'),
+        postgresql_where=sa.text('revoked = 1'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sessions_revoked', table_name='sessions')
+    op.drop_index('ix_sessions_expires_at', table_name='sessions')
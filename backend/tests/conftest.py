@@ -0,0 +1,50 @@
+"""Configuração comum dos testes.
+
+As variáveis de ambiente precisam estar definidas antes do primeiro import de
+app.*, pois settings e os engines são criados no import. Cada execução usa um
+banco SQLite novo, migrado com o Alembic; os testes não compartilham usuários.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+_tmp = tempfile.mkdtemp(prefix="finance-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/finance.db"
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "8192")
+os.environ.setdefault("ARGON2_PARALLELISM", "1")
+os.environ.setdefault("SESSION_REAPER_INTERVAL_SECONDS", "0")
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from tests.helpers import login, register
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    command.upgrade(Config(str(BACKEND_DIR / "alembic.ini")), "head")
+    yield
+
+
+@pytest.fixture(scope="session")
+def app(migrated_database):
+    from app.main import app
+    return app
+
+
+@pytest.fixture
+def client(app):
+    with TestClient(app, base_url="https://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+def user_client(client):
+    """Cliente autenticado como um usuário novo"""
+    login(client, register(client))
+    return client
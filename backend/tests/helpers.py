@@ -0,0 +1,39 @@
+"""Atalhos para montar os dados dos testes pela própria API"""
+import uuid
+from fastapi.testclient import TestClient
+
+
+def register(client: TestClient, password: str = "senha-de-teste") -> str:
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = client.post("/api/users/", json={"name": "Teste", "email": email, "password": password})
+    assert response.status_code == 201, response.text
+    return email
+
+
+def login(client: TestClient, email: str, password: str = "senha-de-teste"):
+    response = client.post("/api/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    return response
+
+
+def create_account(client: TestClient, balance: str = "0", name: str = "Conta") -> dict:
+    response = client.post("/api/accounts/", json={"name": name, "balance": balance, "color": "#000000"})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def create_category(client: TestClient, category_type: str = "EXPENSES", name: str = "Categoria") -> dict:
+    response = client.post("/api/categories/", json={"name": name, "category_type": category_type, "color": "#000000"})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def create_transaction(client: TestClient, account: dict, category: dict, amount: str = "10.00", date: str = "2024-01-15") -> dict:
+    response = client.post("/api/transactions/", json={
+        "amount": amount,
+        "category_id": category["id"],
+        "account_id": account["id"],
+        "date": date,
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,10 @@
+from decimal import Decimal
+from tests.helpers import create_account
+
+
+def test_total_may_exceed_the_digits_of_a_single_balance(user_client):
+    create_account(user_client, balance="99999999.99", name="Conta A")
+    create_account(user_client, balance="99999999.99", name="Conta B")
+    response = user_client.get("/api/accounts/")
+    assert response.status_code == 200, response.text
+    assert Decimal(response.json()["total"]) == Decimal("199999999.98")
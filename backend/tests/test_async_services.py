@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.config import settings
+from app.database import LocalSession, async_url, install_sqlite_pragmas
+from app.exceptions.account import AccountNotFound
+from app.reference_cache import account_cache, category_cache
+from app.repositories.account import AccountRepository, AsyncAccountRepository
+from app.repositories.category import AsyncCategoryRepository, CategoryRepository
+from app.schemas.account import AccountFilters
+from app.schemas.category import CategoryFilters
+from app.services.account import AccountService, AsyncAccountService
+from app.services.category import AsyncCategoryService, CategoryService
+from tests.helpers import create_account, create_category
+
+
+def run_async_read(fn):
+    """Executa fn com uma sessão assíncrona somente leitura, como a de ASYNC_DATABASE"""
+    async def main():
+        engine = create_async_engine(async_url(settings.database_url))
+        install_sqlite_pragmas(engine.sync_engine, read_only=True)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                return await fn(session)
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("cache_enabled", [True, False])
+def test_async_reads_match_the_sync_services(user_client, monkeypatch, cache_enabled):
+    for cache in (account_cache, category_cache):
+        monkeypatch.setattr(cache, "enabled", cache_enabled)
+    user_id = user_client.get("/api/auth/me").json()["user_id"]
+    account = create_account(user_client, balance="15.50", name="Conta A")
+    create_account(user_client, balance="4.50", name="Conta B")
+    category = create_category(user_client, "INCOME", name="Salário")
+    create_category(user_client, "EXPENSES", name="Mercado")
+    account_filters = AccountFilters(offset=0, limit=1)
+    category_filters = CategoryFilters(offset=0, limit=10, category_type="INCOME")
+
+    with LocalSession() as db:
+        accounts = AccountService(db, AccountRepository(db))
+        categories = CategoryService(db, CategoryRepository(db))
+        expected = (
+            accounts.list_all(account_filters, user_id),
+            accounts.get(account["id"], user_id),
+            categories.list_all(category_filters, user_id),
+            categories.get(category["id"], user_id),
+        )
+
+    async def read(session):
+        accounts = AsyncAccountService(session, AsyncAccountRepository(session))
+        categories = AsyncCategoryService(session, AsyncCategoryRepository(session))
+        with pytest.raises(AccountNotFound):
+            await accounts.get(0, user_id)
+        return (
+            await accounts.list_all(account_filters, user_id),
+            await accounts.get(account["id"], user_id),
+            await categories.list_all(category_filters, user_id),
+            await categories.get(category["id"], user_id),
+        )
+
+    assert run_async_read(read) == expected
+    assert expected[0].total_count == 2 and len(expected[0].accounts) == 1
@@ -0,0 +1,52 @@
+"""Cenários do app.cli.benchmark no pytest, sobre poucos dados criados pela API.
+
+Serve para o benchmark não quebrar junto com a API. Com BENCHMARK_BASELINE
+apontando para um arquivo salvo por --save-baseline, também falha quando um
+cenário piora além de BENCHMARK_TOLERANCE (%, padrão 10) ou passa a emitir
+mais instruções SQL por requisição.
+"""
+import json
+import os
+import pytest
+from app.cli.benchmark import SCENARIOS, Context, StatementCounter, compare, run_scenario
+from tests.helpers import create_account, create_category, create_transaction, login, register
+
+PASSWORD = "senha-de-teste"
+
+
+@pytest.fixture
+def context(client):
+    email = register(client, PASSWORD)
+    login(client, email, PASSWORD)
+    account = create_account(client, balance="1000.00")
+    expenses = create_category(client, "EXPENSES")
+    income = create_category(client, "INCOME")
+    for day in range(1, 29):
+        category = income if day % 7 == 0 else expenses
+        create_transaction(client, account, category, amount=f"{day}.50", date=f"2024-03-{day:02d}")
+    return Context(client, email, PASSWORD)
+
+
+@pytest.fixture
+def counter():
+    counter = StatementCounter()
+    yield counter
+    counter.close()
+
+
+def test_benchmark_scenarios(context, counter):
+    baseline_path = os.environ.get("BENCHMARK_BASELINE")
+    baseline = {}
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)["scenarios"]
+    tolerance = float(os.environ.get("BENCHMARK_TOLERANCE", "10"))
+    regressions = []
+    for name, request in SCENARIOS:
+        # run_scenario interrompe com SystemExit em qualquer resposta de erro
+        result = run_scenario(context, counter, request, requests=5, warmup=1)
+        if baseline_path:
+            text, regressed = compare(name, result, baseline.get(name), tolerance)
+            if regressed:
+                regressions.append(f"{name}: {text}")
+    assert not regressions, "\n".join(regressions)
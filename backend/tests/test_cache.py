@@ -0,0 +1,26 @@
+from app.cache import VersionedCache
+
+
+def test_versions_are_bounded():
+    cache = VersionedCache(ttl_seconds=60, max_entries=100, max_versions=3)
+    for key in range(1000):
+        cache.bump(key)
+    assert len(cache._versions) == 3
+
+
+def test_dropped_version_still_rejects_stale_reads():
+    cache = VersionedCache(ttl_seconds=60, max_entries=100, max_versions=1)
+    stale = cache.version("a")
+    cache.bump("a")
+    cache.bump("b")  # descarta a versão de "a"
+    assert "a" not in cache._versions
+    assert not cache.set("a", stale, "antigo")
+    assert cache.set("a", cache.version("a"), "novo")
+    assert cache.get("a") == "novo"
+
+
+def test_clear_rejects_reads_started_before_it():
+    cache = VersionedCache(ttl_seconds=60, max_entries=100)
+    version = cache.version("a")
+    cache.clear()
+    assert not cache.set("a", version, "antigo")
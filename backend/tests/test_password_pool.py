@@ -0,0 +1,60 @@
+import asyncio
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from app import hashing
+from app.metrics import password_hash_duration, password_hash_queue_wait
+from app.security import PasswordHasherPool, argon2_params
+
+
+class BrokenExecutor:
+    """Pool cujo processo morreu: toda submissão falha com BrokenProcessPool"""
+
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("processo do pool terminou"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_broken_pool_is_recreated_and_retried():
+    pool = PasswordHasherPool(workers=1, max_pending=1, queue_timeout=5)
+    broken = pool._executor = BrokenExecutor()
+    try:
+        password_hash = asyncio.run(pool.run(hashing.hash_password, "senha-123", argon2_params))
+        assert broken.shut_down
+        assert pool._executor is not broken
+        assert hashing.verify_password("senha-123", password_hash, argon2_params)
+    finally:
+        pool.shutdown()
+
+
+def slow_hash(seconds: float) -> str:
+    time.sleep(seconds)
+    return "hash"
+
+
+def _sum_and_count(histogram, operation: str):
+    values = {suffix: value for suffix, labels, _, value in histogram.samples() if labels == (operation,)}
+    return values["_sum"], values["_count"]
+
+
+def test_hash_duration_excludes_the_queue_wait():
+    pool = PasswordHasherPool(workers=0, max_pending=1, queue_timeout=5)
+
+    async def two_at_once():
+        return await asyncio.gather(pool.run(slow_hash, 0.2), pool.run(slow_hash, 0.2))
+
+    assert asyncio.run(two_at_once()) == ["hash", "hash"]
+    duration_sum, duration_count = _sum_and_count(password_hash_duration, "slow_hash")
+    wait_sum, wait_count = _sum_and_count(password_hash_queue_wait, "slow_hash")
+    assert duration_count == wait_count == 2
+    assert duration_sum >= 0.4
+    # com uma vaga só, a segunda operação espera a primeira terminar, e essa
+    # espera aparece no histograma da fila, não no da duração do hash
+    assert wait_sum >= 0.15
@@ -0,0 +1,17 @@
+from app.cli.check_query_plans import collect_queries, explain, table_scans
+from app.database import LocalSession
+from app.repositories.rollup import TransactionRollupRepository
+from app.repositories.transaction import TransactionRepository
+
+
+def test_transaction_queries_do_not_scan_the_table():
+    """As mesmas consultas do check_query_plans, no banco migrado pelos testes"""
+    failures = []
+    with LocalSession() as session:
+        repo = TransactionRepository(session)
+        rollup_repo = TransactionRollupRepository(session)
+        for name, filter_by, query in collect_queries(repo, rollup_repo):
+            plan = explain(session, query)
+            if table_scans(plan):
+                failures.append((name, filter_by, plan))
+    assert not failures, "\n".join(f"{name} {filter_by}: {plan}" for name, filter_by, plan in failures)
@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+from app.reference_cache import ReferenceCache
+from app.schemas.account import AccountResponseDTO
+
+
+class CountingRepository:
+    def __init__(self, count: int):
+        self.count = count
+        self.calls = 0
+
+    def list_all(self, limit, filter_by, order_by):
+        self.calls += 1
+        return [SimpleNamespace(id=index) for index in range(1, min(self.count, limit) + 1)]
+
+
+def test_oversize_user_is_not_queried_again_until_invalidated():
+    cache = ReferenceCache("accounts", AccountResponseDTO, ttl_seconds=60, max_rows=100, max_rows_per_user=2)
+    repo = CountingRepository(count=3)
+    assert cache.load(repo, user_id=1) is None
+    assert cache.load(repo, user_id=1) is None
+    assert repo.calls == 1
+    cache.invalidate(1)
+    assert cache.load(repo, user_id=1) is None
+    assert repo.calls == 2
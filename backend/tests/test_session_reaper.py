@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from app.database import LocalSession, engine
+from app.maintenance import reap_sessions
+from app.models.session import UserSession
+from app.repositories.session import UserSessionRepository
+
+
+def test_cleanup_query_uses_the_session_indexes():
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    with LocalSession() as db:
+        query = UserSessionRepository(db).expired_ids_query(now, 500)
+    query = query.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {query}"))
+    assert "ix_sessions_expires_at" in plan and "ix_sessions_revoked" in plan
+    assert "SCAN sessions" not in plan
+
+
+def test_reaper_stats_are_exported(user_client):
+    user_id = user_client.get("/api/auth/me").json()["user_id"]
+    past = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=1)
+    with LocalSession() as db:
+        db.execute(update(UserSession).where(UserSession.user_id == user_id).values(expires_at=past))
+        db.commit()
+    assert reap_sessions(batch_size=100) >= 1
+    lines = user_client.get("/metrics").text.splitlines()
+    values = {line.split(" ")[0]: float(line.split(" ")[1]) for line in lines if line.startswith("session_reaper_")}
+    assert values["session_reaper_runs_total"] >= 1
+    assert values["session_reaper_reclaimed_total"] >= 1
+    assert values["session_reaper_last_run_timestamp_seconds"] > 0
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import event, update
+from app.database import LocalSession, async_engine, engine
+from app.models.session import UserSession
+from app.security import session_cache
+
+
+@pytest.fixture
+def session_updates():
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE SESSIONS"):
+            statements.append(statement)
+
+    # com ASYNC_DATABASE ligado, o authorize_async grava pelo engine assíncrono
+    engines = [engine] if async_engine is None else [engine, async_engine.sync_engine]
+    for target in engines:
+        event.listen(target, "before_cursor_execute", on_execute)
+    yield statements
+    for target in engines:
+        event.remove(target, "before_cursor_execute", on_execute)
+
+
+def expire_sessions_soon(user_client):
+    """Coloca a sessão do cliente dentro da janela de renovação"""
+    user_id = user_client.get("/api/auth/me").json()["user_id"]
+    soon = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=5)
+    with LocalSession() as db:
+        db.execute(update(UserSession).where(UserSession.user_id == user_id).values(expires_at=soon))
+        db.commit()
+
+
+@pytest.mark.parametrize("near_expiry, expected_updates", [(False, 0), (True, 1)])
+def test_authorized_requests_update_the_session_at_most_once(user_client, session_updates, near_expiry, expected_updates):
+    if near_expiry:
+        expire_sessions_soon(user_client)
+    session_updates.clear()
+    for _ in range(10):
+        # sem o cache, toda requisição passa pela validação no banco
+        session_cache.clear()
+        response = user_client.get("/api/accounts/")
+        assert response.status_code == 200, response.text
+    assert len(session_updates) == expected_updates
@@ -0,0 +1,33 @@
+from decimal import Decimal
+from app.database import LocalSession
+from app.repositories.transaction import TransactionRepository
+from tests.helpers import create_account, create_category, create_transaction
+
+
+def test_empty_update_is_a_successful_no_op(user_client):
+    account = create_account(user_client, balance="100.00")
+    category = create_category(user_client, "EXPENSES")
+    unchanged = create_transaction(user_client, account, category, amount="10.00")
+    changed = create_transaction(user_client, account, category, amount="20.00")
+    response = user_client.post("/api/transactions/batch", json={"operations": [
+        {"op": "update", "id": unchanged["id"], "data": {}},
+        {"op": "update", "id": changed["id"], "data": {"amount": "25.00"}},
+        {"op": "create", "data": {
+            "amount": "5.00",
+            "category_id": category["id"],
+            "account_id": account["id"],
+            "date": "2024-01-20",
+        }},
+    ]})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["applied"], body["failed"]) == (3, 0)
+    assert user_client.get(f"/api/transactions/{unchanged['id']}").json()["amount"] == "10.00"
+    assert user_client.get(f"/api/transactions/{changed['id']}").json()["amount"] == "25.00"
+    balance = user_client.get(f"/api/accounts/{account['id']}").json()["balance"]
+    assert Decimal(balance) == Decimal("100.00") - Decimal("10.00") - Decimal("25.00") - Decimal("5.00")
+
+
+def test_bulk_update_skips_ids_without_changes():
+    with LocalSession() as db:
+        assert TransactionRepository(db).bulk_update({1: {}, 2: {}}) in (0, None)
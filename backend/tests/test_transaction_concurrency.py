@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from tests.helpers import create_account, create_category
+
+
+def test_parallel_creates_keep_the_account_balance(user_client):
+    # as rotas síncronas rodam no threadpool: as escritas concorrem de verdade no banco
+    account = create_account(user_client, balance="1000.00")
+    income = create_category(user_client, "INCOME", name="Receita")
+    expense = create_category(user_client, "EXPENSES", name="Despesa")
+    deltas = [(income, Decimal(f"{index}.25")) if index % 2 else (expense, Decimal(f"{index}.10")) for index in range(1, 41)]
+
+    def post(item):
+        category, amount = item
+        return user_client.post("/api/transactions/", json={
+            "amount": str(amount),
+            "category_id": category["id"],
+            "account_id": account["id"],
+            "date": "2024-01-15",
+        })
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(post, deltas))
+    assert [response.status_code for response in responses] == [201] * len(deltas)
+    expected = Decimal("1000.00") + sum(amount if category is income else -amount for category, amount in deltas)
+    balance = user_client.get(f"/api/accounts/{account['id']}").json()["balance"]
+    assert Decimal(balance) == expected
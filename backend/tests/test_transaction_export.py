@@ -0,0 +1,24 @@
+import csv
+import io
+from tests.helpers import create_account, create_category, create_transaction
+
+
+def test_export_is_not_paginated(user_client):
+    account = create_account(user_client)
+    category = create_category(user_client)
+    for day in range(1, 4):
+        create_transaction(user_client, account, category, date=f"2024-05-0{day}")
+    # limit, offset e cursor não fazem parte da exportação e são ignorados
+    response = user_client.get("/api/transactions/export", params={"limit": 500, "order_by": "date:asc"})
+    assert response.status_code == 200, response.text
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["date"] for row in rows] == ["2024-05-01", "2024-05-02", "2024-05-03"]
+
+
+def test_export_parameters_in_openapi(app):
+    parameters = {
+        parameter["name"]
+        for parameter in app.openapi()["paths"]["/api/transactions/export"]["get"]["parameters"]
+    }
+    assert "format" in parameters and "start_date" in parameters
+    assert not parameters & {"limit", "offset", "cursor", "summary", "include_total"}
@@ -0,0 +1,92 @@
+import io
+from decimal import Decimal
+from pathlib import Path
+from app.importers import iter_csv_rows, iter_ofx_rows
+from tests.helpers import create_account, create_category
+
+STATEMENT = Path(__file__).parent / "fixtures" / "statement.ofx"
+
+
+def test_ofx_rows_keep_the_transaction_type():
+    rows = [row for _, row in iter_ofx_rows(io.BytesIO(STATEMENT.read_bytes()))]
+    assert [(row["amount"], row["category_type"]) for row in rows] == [
+        ("1000.00", "INCOME"),
+        ("62.50", "EXPENSES"),
+        ("0.00", "INCOME"),  # sem sinal, vale o TRNTYPE
+    ]
+    assert rows[0]["date"] == "2024-03-05"
+
+
+def import_statement(client, **form):
+    return client.post(
+        "/api/transactions/import",
+        files={"file": ("extrato.ofx", STATEMENT.read_bytes(), "application/x-ofx")},
+        data=form,
+    )
+
+
+def test_ofx_import_books_credits_as_income(user_client):
+    account = create_account(user_client, "100.00")
+    income = create_category(user_client, "INCOME", "Salário")
+    expenses = create_category(user_client, "EXPENSES", "Mercado")
+    response = import_statement(
+        user_client,
+        account_id=account["id"],
+        income_category_id=income["id"],
+        expense_category_id=expenses["id"],
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"imported": 3, "failed": 0, "errors": []}
+
+    balance = user_client.get(f"/api/accounts/{account['id']}").json()["balance"]
+    assert Decimal(balance) == Decimal("100.00") + Decimal("1000.00") - Decimal("62.50")
+    data = user_client.get("/api/transactions/", params={"order_by": "date:asc"}).json()["data"]
+    assert [(t["amount"], t["category"]["id"]) for t in data] == [
+        ("1000.00", income["id"]),
+        ("62.50", expenses["id"]),
+        ("0.00", income["id"]),
+    ]
+
+
+def test_ofx_import_rejects_rows_whose_category_has_the_other_type(user_client):
+    account = create_account(user_client, "100.00")
+    expenses = create_category(user_client, "EXPENSES")
+    response = import_statement(user_client, account_id=account["id"], category_id=expenses["id"])
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (1, 2)
+    assert [error["row"] for error in result["errors"]] == [1, 3]
+    balance = user_client.get(f"/api/accounts/{account['id']}").json()["balance"]
+    assert Decimal(balance) == Decimal("37.50")
+
+
+def import_csv(client, content: bytes, **form):
+    return client.post(
+        "/api/transactions/import",
+        files={"file": ("extrato.csv", content, "text/csv")},
+        data=form,
+    )
+
+
+def test_csv_rows_fall_back_to_cp1252():
+    content = "date,amount,comment\n2024-03-01,10.00,Padaria São João\n2024-03-02,5.00,Café\n".encode("cp1252")
+    rows = [row for _, row in iter_csv_rows(io.BytesIO(content))]
+    assert [row["comment"] for row in rows] == ["Padaria São João", "Café"]
+
+
+def test_csv_import_accepts_latin1_files(user_client):
+    account = create_account(user_client, "100.00")
+    expenses = create_category(user_client, "EXPENSES")
+    content = "date,amount,comment\n2024-03-01,10.00,Padaria São João\n".encode("latin-1")
+    response = import_csv(user_client, content, account_id=account["id"], category_id=expenses["id"])
+    assert response.status_code == 200, response.text
+    assert response.json()["imported"] == 1
+    data = user_client.get("/api/transactions/").json()["data"]
+    assert data[0]["comment"] == "Padaria São João"
+
+
+def test_malformed_csv_is_rejected_with_400(user_client):
+    content = b"date,amount,comment\n2024-03-01,10.00," + b"x" * 200_000 + b"\n"
+    response = import_csv(user_client, content)
+    assert response.status_code == 400, response.text
+    assert response.json()["error"] == "invalid_import_file"
@@ -0,0 +1,38 @@
+import re
+import pytest
+from tests.helpers import create_account, create_category, create_transaction
+
+
+def statement_count(response) -> int:
+    """Instruções SQL da requisição, informadas pelo QueryStatsMiddleware em Server-Timing"""
+    match = re.search(r'desc="(\d+) queries"', response.headers["server-timing"])
+    assert match, response.headers["server-timing"]
+    return int(match.group(1))
+
+
+@pytest.fixture
+def transactions(user_client):
+    account = create_account(user_client, "1000.00")
+    category = create_category(user_client)
+    for day in range(1, 29):
+        create_transaction(user_client, account, category, amount=f"{day}.00", date=f"2024-02-{day:02d}")
+    # aquece o cache de sessões: a autorização deixa de contar instruções
+    user_client.get("/api/transactions/", params={"limit": 1})
+    return user_client
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"include_total": False},
+    {"order_by": "amount:desc"},
+    {"year": 2024, "month": 2},
+])
+def test_statement_count_does_not_depend_on_page_size(transactions, params):
+    counts = {}
+    for limit in (1, 10, 100):
+        response = transactions.get("/api/transactions/", params={**params, "limit": limit})
+        assert response.status_code == 200, response.text
+        assert len(response.json()["data"]) == min(limit, 28)
+        counts[limit] = statement_count(response)
+    assert len(set(counts.values())) == 1, counts
+    assert counts[1] > 0